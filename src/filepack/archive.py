@@ -1,6 +1,9 @@
+from __future__ import annotations
+
 import tempfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 from tabulate import tabulate
 
@@ -15,9 +18,12 @@ from filepack.archives.exceptions import (
     FailedToRemoveArchiveMembers,
 )
 from filepack.archives.models import (
+    SUFFIX_TO_TYPE,
     AbsractArchiveClient,
     AbstractArchiveMember,
+    AbstractArchiveObject,
     ArchiveType,
+    build_member_index,
 )
 from filepack.archives.seven_zip import SevenZipClient
 from filepack.archives.tar import TarClient
@@ -25,6 +31,13 @@ from filepack.archives.zip import ZipClient
 from filepack.consts import ERROR_MESSAGE_NOT_SUPPORTED
 from filepack.utils import get_file_type_extension, reraise_as
 
+# the clients are stateless, so a single instance of each is shared
+_ARCHIVE_CLIENTS: dict[ArchiveType, AbsractArchiveClient] = {
+    ArchiveType.TAR: TarClient(),
+    ArchiveType.ZIP: ZipClient(),
+    ArchiveType.SEVEN_ZIP: SevenZipClient(),
+}
+
 
 class Archive:
     def __init__(self, path: str | Path) -> None:
@@ -38,32 +51,48 @@ class Archive:
             ValueError: If the archive type is unsupported.
         """
         self._path = Path(path)
+        self._entered = False
+        self._opened: Optional[AbstractArchiveObject] = None
+        self._members_cache: dict[
+            tuple[Path, int, int],
+            tuple[
+                list[AbstractArchiveMember], dict[str, AbstractArchiveMember]
+            ],
+        ] = {}
+
+        # first try to infer the type from the extension
+        archive_type = SUFFIX_TO_TYPE.get(self._path.suffix.lstrip("."))
+
+        # if the extension is unknown and the file exists, get the type
+        # according to magic numbers
+        if archive_type is None and self._path.exists():
+            archive_type = SUFFIX_TO_TYPE.get(
+                get_file_type_extension(path=self._path) or ""
+            )
 
-        # if doesn't exist, try to infer the desired type from the extension
-        if not self._path.exists():
-            try:
-                self._type = ArchiveType(self._path.suffix.lstrip("."))
-            except Exception:
-                raise ValueError(ERROR_MESSAGE_NOT_SUPPORTED)
-
-        # if exist, get the type according to magic numbers
-        else:
-            self._type = ArchiveType(get_file_type_extension(path=self._path))
+        if archive_type is None:
+            raise ValueError(ERROR_MESSAGE_NOT_SUPPORTED)
 
-        self._client: AbsractArchiveClient
+        self._type = archive_type
+        self._client = _ARCHIVE_CLIENTS[self._type]
 
-        match self._type:
-            case ArchiveType.TAR:
-                self._client = TarClient()
+    def __enter__(self) -> Archive:
+        """
+        Keeps the archive open for reading until the context exits, so consecutive operations don't reopen it.
 
-            case ArchiveType.ZIP:
-                self._client = ZipClient()
+        Returns:
+            The archive itself.
+        """
+        self._entered = True
+        self._open_archive_object()
+        return self
 
-            case ArchiveType.SEVEN_ZIP:
-                self._client = SevenZipClient()
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._entered = False
+        self._close_archive_object()
 
-            case _:
-                raise ValueError(ERROR_MESSAGE_NOT_SUPPORTED)
+    def __del__(self):
+        self._close_archive_object()
 
     @property
     def path(self) -> Path:
@@ -83,11 +112,11 @@ class Archive:
         Returns:
             The size of the archive in bytes. Returns 0 if the path does not exist.
         """
-        if not self.path_exists():
+        try:
+            return self._path.stat().st_size
+        except FileNotFoundError:
             return 0
 
-        return self._path.stat().st_size
-
     def path_exists(self):
         """
         Checks if the archive path exists.
@@ -120,16 +149,8 @@ class Archive:
         Raises:
             FailedToGetArchiveMembers: If there's an issue retrieving the archive members.
         """
-        if not self.path_exists():
-            return []
-
-        with self._client.open(
-            file_path=self._path, mode="r"
-        ) as archive_object:
-            return [
-                archive_object
-                for archive_object in archive_object.get_members()
-            ]
+        members, _ = self._get_cached_members()
+        return list(members)
 
     @reraise_as(FailedToGetArchiveMember)
     def get_member(self, member_name: str) -> Optional[AbstractArchiveMember]:
@@ -145,17 +166,15 @@ class Archive:
         Raises:
             FailedToGetArchiveMember: If there's an issue retrieving the member.
         """
-        if not self.path_exists():
-            return None
-
-        with self._client.open(
-            file_path=self._path, mode="r"
-        ) as archive_object:
-            return archive_object.get_member(member_name=member_name)
+        _, member_index = self._get_cached_members()
+        return member_index.get(member_name)
 
     @reraise_as(FailedToExtractArchiveMembers)
     def extract_all(
-        self, target_directory_path: str | Path, in_place: bool = False
+        self,
+        target_directory_path: str | Path,
+        in_place: bool = False,
+        parallel: bool = True,
     ):
         """
         Extracts all members from the archive to a target directory.
@@ -163,20 +182,26 @@ class Archive:
         Args:
             target_directory_path: The directory path to extract the archive members to.
             in_place: If True, deletes the archive after extraction.
+            parallel: If True, extracts members concurrently when the archive type allows it.
 
         Raises:
             FailedToExtractArchiveMembers: If there's an issue extracting the archive members.
         """
-        if self.get_members() == []:
+        if not self.path_exists():
             return
 
-        with self._client.open(self._path, "r") as archive_object:
+        with self._reading_archive() as archive_object:
+            if archive_object.get_members() == []:
+                return
+
             archive_object.extract_all(
-                target_directory_path=Path(target_directory_path)
+                target_directory_path=Path(target_directory_path),
+                parallel=parallel,
             )
 
         if in_place:
-            self._path.unlink()
+            with self._modifying_archive():
+                self._path.unlink()
 
     @reraise_as(FailedToExtractArchiveMember)
     def extract_member(
@@ -196,10 +221,13 @@ class Archive:
         Raises:
             FailedToExtractArchiveMember: If there's an issue extracting the archive member.
         """
-        if self.get_member(member_name=member_name) is None:
+        if not self.path_exists():
             raise ArchiveMemberDoesNotExist()
 
-        with self._client.open(self._path, "r") as archive_object:
+        with self._reading_archive() as archive_object:
+            if archive_object.get_member(member_name=member_name) is None:
+                raise ArchiveMemberDoesNotExist()
+
             archive_object.extract_member(
                 member_name=member_name,
                 target_directory_path=Path(target_directory_path),
@@ -208,7 +236,6 @@ class Archive:
         if in_place:
             self.remove_member(member_name=member_name)
 
-    @reraise_as(FailedToAddNewMemberToArchive)
     def add_member(self, member_path: str | Path, in_place: bool = False):
         """
         Adds a new member to the archive.
@@ -220,16 +247,39 @@ class Archive:
         Raises:
             FailedToAddNewMemberToArchive: If there's an issue adding the new member to the archive.
         """
-        member_path = Path(member_path)
+        self.add_members(member_paths=[member_path], in_place=in_place)
 
-        if not member_path.exists():
+    @reraise_as(FailedToAddNewMemberToArchive)
+    def add_members(
+        self, member_paths: Iterable[str | Path], in_place: bool = False
+    ):
+        """
+        Adds new members to the archive, opening it only once.
+
+        Args:
+            member_paths: The paths to the files to be added to the archive.
+            in_place: If True, deletes the files after adding them to the archive.
+
+        Raises:
+            FailedToAddNewMemberToArchive: If there's an issue adding the new members to the archive.
+        """
+        paths = [Path(member_path) for member_path in member_paths]
+
+        if not all(path.exists() for path in paths):
             raise FileNotFoundError()
 
-        with self._client.open(self._path, "a") as archive_object:
-            archive_object.add_member(member_path=member_path)
+        # a new archive has no central directory to parse, so it is created
+        # in write mode rather than appended to
+        mode = "a" if self.path_exists() else "w"
+
+        with self._modifying_archive():
+            with self._client.open(self._path, mode) as archive_object:
+                for path in paths:
+                    archive_object.add_member(member_path=path)
 
         if in_place:
-            member_path.unlink()
+            for path in paths:
+                path.unlink()
 
     @reraise_as(FailedToRemoveArchiveMember)
     def remove_member(self, member_name: str):
@@ -245,27 +295,28 @@ class Archive:
         if not self.member_exist(member_name=member_name):
             raise ArchiveMemberDoesNotExist()
 
-        with tempfile.TemporaryDirectory() as temporary_directory:
-            temporary_directory_members_path = (
-                Path(temporary_directory) / "files"
-            )
-            temporary_directory_members_path.mkdir()
-
-            for member in self.get_members():
-                if not member.name == member_name:
-                    with self._client.open(self._path, "r") as archive_object:
-                        archive_object.extract_member(
-                            member_name=member.name,
-                            target_directory_path=temporary_directory_members_path,
-                        )
-
+        # the new archive is built next to the old one, so it can replace it
+        # with a rename, which can't cross file systems
+        with tempfile.TemporaryDirectory(
+            dir=self._path.parent
+        ) as temporary_directory:
             new_archive_path = Path(temporary_directory) / "new_archive"
 
-            with self._client.open(new_archive_path, "w") as new_file:
-                for file in temporary_directory_members_path.iterdir():
-                    new_file.add_member(member_path=file)
-
-            new_archive_path.rename(self._path)
+            with self._reading_archive() as archive_object:
+                with self._client.open(
+                    new_archive_path, "w"
+                ) as new_archive_object:
+                    archive_object.copy_members_to(
+                        target_archive_object=new_archive_object,
+                        member_names=[
+                            member.name
+                            for member in archive_object.get_members()
+                            if not member.name == member_name
+                        ],
+                    )
+
+            with self._modifying_archive():
+                new_archive_path.rename(self._path)
 
     @reraise_as(FailedToRemoveArchiveMembers)
     def remove_all(self):
@@ -275,22 +326,78 @@ class Archive:
         Raises:
             FailedToRemoveArchiveMembers: If there's an issue removing the archive members.
         """
-        if not self.path_exists():
-            return None
-
-        self._path.unlink()
+        with self._modifying_archive():
+            self._path.unlink(missing_ok=True)
 
     def print_members(self):
         """
         Prints the metadata of all members in the archive in a tabular format.
         """
-        members_metadata = [
-            {
-                "name": member.name,
-                "mtime": member.mtime,
-                "size": str(member.size) + "B",
-                "type": member.type,
-            }
-            for member in self.get_members()
-        ]
+        members_metadata = []
+
+        if self.path_exists():
+            # a single handle serves the type detection of every member
+            with self._reading_archive() as archive_object:
+                members_metadata = [
+                    {
+                        "name": member.name,
+                        "mtime": member.mtime,
+                        "size": str(member.size) + "B",
+                        "type": member.type_from(
+                            archive_object=archive_object
+                        ),
+                    }
+                    for member in archive_object.get_members()
+                ]
+
         print(tabulate(members_metadata, headers="keys", tablefmt="grid"))
+
+    def _get_cached_members(
+        self,
+    ) -> tuple[list[AbstractArchiveMember], dict[str, AbstractArchiveMember]]:
+        try:
+            stat = self._path.stat()
+        except FileNotFoundError:
+            return [], {}
+
+        cache_key = (self._path, stat.st_mtime_ns, stat.st_size)
+
+        if (cached_members := self._members_cache.get(cache_key)) is None:
+            with self._reading_archive() as archive_object:
+                members = archive_object.get_members()
+
+            cached_members = (members, build_member_index(members=members))
+            self._members_cache = {cache_key: cached_members}
+
+        return cached_members
+
+    @contextmanager
+    def _reading_archive(self) -> Iterator[AbstractArchiveObject]:
+        if self._opened is not None:
+            yield self._opened
+            return
+
+        with self._client.open(self._path, "r") as archive_object:
+            yield archive_object
+
+    @contextmanager
+    def _modifying_archive(self) -> Iterator[None]:
+        # the open handle and the cached members go stale once the archive
+        # changes, so the handle is reopened after the change
+        self._members_cache.clear()
+        self._close_archive_object()
+
+        try:
+            yield
+        finally:
+            if self._entered:
+                self._open_archive_object()
+
+    def _open_archive_object(self):
+        if self._opened is None and self.path_exists():
+            self._opened = self._client.open(self._path, "r").__enter__()
+
+    def _close_archive_object(self):
+        if (opened := getattr(self, "_opened", None)) is not None:
+            self._opened = None
+            opened.__exit__(None, None, None)
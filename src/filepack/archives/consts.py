@@ -3,3 +3,27 @@ from typing import Final
 TAR_SUFFIX: Final[str] = "tar"
 ZIP_SUFFIX: Final[str] = "zip"
 SEVEN_ZIP_SUFFIX: Final[str] = "7z"
+
+MTIME_FORMAT: Final[str] = "%a, %d %b %Y %H:%M:%S UTC"
+
+# the amount of bytes filetype inspects when guessing a file type
+MEMBER_HEADER_SIZE: Final[int] = 8192
+
+# the layout of a zip entry's local header, which ends with the lengths of
+# the file name and extra field that follow it
+ZIP_LOCAL_HEADER_FORMAT: Final[str] = "<4s2B4HL2L2H"
+ZIP_LOCAL_HEADER_SIGNATURE: Final[bytes] = b"PK\x03\x04"
+
+# the general purpose flag of zip entries whose sizes follow their data, in
+# a data descriptor of the paired layout
+ZIP_DATA_DESCRIPTOR_FLAG: Final[int] = 0x08
+ZIP_DATA_DESCRIPTOR_FORMAT: Final[str] = "<4sLLL"
+ZIP64_DATA_DESCRIPTOR_FORMAT: Final[str] = "<4sLQQ"
+ZIP_DATA_DESCRIPTOR_SIGNATURE: Final[bytes] = b"PK\x07\x08"
+
+# entries larger than this need zip64 fields, which zipfile adds on its own
+ZIP64_LIMIT: Final[int] = (1 << 31) - 1
+ZIP64_EXTRA_FIELD_ID: Final[int] = 0x0001
+
+# the size of the chunks compressed zip entries are copied in
+ZIP_COPY_BUFSIZE: Final[int] = 1024 * 1024
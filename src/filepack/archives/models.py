@@ -1,12 +1,23 @@
-import tempfile
+import io
+import os
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from enum import Enum
+from functools import cached_property
+from itertools import batched
 from pathlib import Path
-from typing import Optional
-
-from filepack.archives.consts import SEVEN_ZIP_SUFFIX, TAR_SUFFIX, ZIP_SUFFIX
+from typing import Iterator, Optional
+
+from filepack.archives.consts import (
+    MEMBER_HEADER_SIZE,
+    MTIME_FORMAT,
+    SEVEN_ZIP_SUFFIX,
+    TAR_SUFFIX,
+    ZIP_SUFFIX,
+)
 from filepack.archives.types import ArchiveObjectTypes
-from filepack.utils import get_file_type_extension
+from filepack.utils import get_buffer_type_extension
 
 
 class ArchiveType(Enum):
@@ -17,6 +28,11 @@ class ArchiveType(Enum):
     SEVEN_ZIP = SEVEN_ZIP_SUFFIX
 
 
+SUFFIX_TO_TYPE: dict[str, ArchiveType] = {
+    archive_type.value: archive_type for archive_type in ArchiveType
+}
+
+
 class UnknownFileType:
     """Represents an unknown file type within an archive."""
 
@@ -30,50 +46,156 @@ class AbstractArchiveObject(ABC):
         archive_object: ArchiveObjectTypes,
         client: "AbsractArchiveClient",
         path: Path,
+        source_file: Optional[io.IOBase] = None,
     ) -> None:
         self._archive_object = archive_object
         self._client = client
         self._path = path
+        self._source_file = source_file
+        self._members: Optional[list["AbstractArchiveMember"]] = None
+        self._member_index: Optional[dict[str, "AbstractArchiveMember"]] = None
 
     def __enter__(self) -> "AbstractArchiveObject":
         self._archive_object = self._archive_object.__enter__()
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        return self._archive_object.__exit__(exc_type, exc_value, traceback)
-
-    def extract_all(self, target_directory_path: Path):
-        for member in self.get_members():
-            self.extract_member(
-                member_name=member.name,
-                target_directory_path=target_directory_path,
+        try:
+            return self._archive_object.__exit__(
+                exc_type, exc_value, traceback
             )
+        finally:
+            if self._source_file is not None:
+                self._source_file.close()
+
+    def extract_all(self, target_directory_path: Path, parallel: bool = True):
+        self._extract_members(
+            archive_object=self,
+            member_names=[member.name for member in self.get_members()],
+            target_directory_path=target_directory_path,
+        )
 
     def get_member(
         self, member_name: str
     ) -> Optional["AbstractArchiveMember"]:
-        try:
+        # a single lookup stops at the first match instead of building
+        # every member
+        if self._members is None:
             return next(
-                member
-                for member in self.get_members()
-                if member.name == member_name
+                (
+                    member
+                    for member in self._iter_members()
+                    if member.name == member_name
+                ),
+                None,
             )
-        except StopIteration:
-            return None
 
-    @abstractmethod
+        if self._member_index is None:
+            self._member_index = build_member_index(members=self._members)
+        return self._member_index.get(member_name)
+
     def get_members(self) -> list["AbstractArchiveMember"]:
+        # the members are read once per opened archive
+        if self._members is None:
+            self._members = list(self._iter_members())
+        return self._members
+
+    def add_member(self, member_path: Path):
+        self._members = self._member_index = None
+        self._add_member(member_path=member_path)
+
+    @abstractmethod
+    def _iter_members(self) -> Iterator["AbstractArchiveMember"]:
         pass
 
+    def _extract_members_in_parallel(
+        self, member_names: list[str], target_directory_path: Path
+    ):
+        workers_count = min(len(member_names), os.cpu_count() or 1)
+        if workers_count <= 1:
+            self._extract_members(
+                archive_object=self,
+                member_names=member_names,
+                target_directory_path=target_directory_path,
+            )
+            return
+
+        target_directory_path.mkdir(parents=True, exist_ok=True)
+
+        # every worker gets an even, contiguous run of members, so its reads
+        # move forward through the archive
+        chunk_size = -(-len(member_names) // workers_count)
+        workers_member_names = [
+            list(worker_member_names)
+            for worker_member_names in batched(member_names, chunk_size)
+        ]
+
+        def extract_with_own_handle(worker_member_names: list[str]):
+            # every worker reads through its own handle of the archive
+            with self._client.open(self._path, "r") as archive_object:
+                for member_name in worker_member_names:
+                    try:
+                        archive_object.extract_member(
+                            member_name=member_name,
+                            target_directory_path=target_directory_path,
+                        )
+                    except FileExistsError:
+                        # another worker created a directory this member
+                        # shares between the extractor's check for it and
+                        # its own mkdir, so a second attempt finds it there
+                        archive_object.extract_member(
+                            member_name=member_name,
+                            target_directory_path=target_directory_path,
+                        )
+
+        with ThreadPoolExecutor(max_workers=workers_count) as executor:
+            list(executor.map(extract_with_own_handle, workers_member_names))
+
+    @staticmethod
+    def _extract_members(
+        archive_object: "AbstractArchiveObject",
+        member_names: list[str],
+        target_directory_path: Path,
+    ):
+        for member_name in member_names:
+            archive_object.extract_member(
+                member_name=member_name,
+                target_directory_path=target_directory_path,
+            )
+
     @abstractmethod
     def extract_member(self, member_name: str, target_directory_path: Path):
         pass
 
     @abstractmethod
-    def add_member(self, member_path: Path):
+    def read_header(
+        self, member_name: str, nbytes: int = MEMBER_HEADER_SIZE
+    ) -> bytes:
+        pass
+
+    @abstractmethod
+    def _add_member(self, member_path: Path):
+        pass
+
+    @abstractmethod
+    def copy_members_to(
+        self,
+        target_archive_object: "AbstractArchiveObject",
+        member_names: list[str],
+    ):
         pass
 
 
+def build_member_index(
+    members: list["AbstractArchiveMember"],
+) -> dict[str, "AbstractArchiveMember"]:
+    # the first member wins when an archive holds the same name twice
+    member_index: dict[str, "AbstractArchiveMember"] = {}
+    for member in members:
+        member_index.setdefault(member.name, member)
+    return member_index
+
+
 class AbsractArchiveClient(ABC):
     @abstractmethod
     def open(self, file_path: Path, mode: str) -> AbstractArchiveObject:
@@ -87,13 +209,11 @@ class AbstractArchiveMember(ABC):
         archive_path: Path,
         name: str,
         size: int,
-        mtime: str,
     ) -> None:
         self._client = client
         self._archive_path = archive_path
         self._name = name
         self._size = size
-        self._mtime = mtime
 
     @property
     def name(self) -> str:
@@ -103,26 +223,24 @@ class AbstractArchiveMember(ABC):
     def size(self) -> int:
         return self._size
 
-    @property
+    @cached_property
     def mtime(self) -> str:
-        return self._mtime
+        # formatted on first access, since listing members rarely needs it
+        return self._get_mtime().strftime(MTIME_FORMAT)
 
     @property
     def type(self) -> str:
         with self._client.open(self._archive_path, "r") as archive_object:
-            with tempfile.TemporaryDirectory() as temporary_directory:
-                temporary_directory_path = (
-                    Path(temporary_directory) / self._name
-                )
-                archive_object.extract_member(
-                    member_name=self._name,
-                    target_directory_path=temporary_directory_path,
-                )
-
-                try:
-                    type = get_file_type_extension(
-                        path=temporary_directory_path
-                    )
-                    return type if type is not None else str(UnknownFileType())
-                except Exception:
-                    return str(UnknownFileType())
+            return self.type_from(archive_object=archive_object)
+
+    def type_from(self, archive_object: AbstractArchiveObject) -> str:
+        try:
+            header = archive_object.read_header(member_name=self._name)
+            type = get_buffer_type_extension(buffer=header)
+            return type if type is not None else str(UnknownFileType())
+        except Exception:
+            return str(UnknownFileType())
+
+    @abstractmethod
+    def _get_mtime(self) -> datetime:
+        pass
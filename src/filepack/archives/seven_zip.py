@@ -1,8 +1,12 @@
+import tempfile
+from datetime import datetime
 from pathlib import Path
-from typing import cast
+from typing import Iterator, cast
 
 from py7zr import FileInfo, SevenZipFile
+from py7zr.io import BytesIOFactory
 
+from filepack.archives.consts import MEMBER_HEADER_SIZE
 from filepack.archives.models import (
     AbsractArchiveClient,
     AbstractArchiveMember,
@@ -24,24 +28,68 @@ class SevenZipObject(AbstractArchiveObject):
         assert isinstance(self._archive_object, SevenZipFile)
         self._archive_object = cast(SevenZipFile, self._archive_object)
 
-    def get_members(self) -> list[AbstractArchiveMember]:
-        return [
-            SevenZipMember(
+    def _iter_members(self) -> Iterator[AbstractArchiveMember]:
+        for seven_zip_info_object in self._archive_object.list():  # type: ignore
+            yield SevenZipMember(
                 member=seven_zip_info_object,
                 client=self._client,
                 archive_path=self._path,
             )
-            for seven_zip_info_object in self._archive_object.list()  # type: ignore
-        ]
+
+    def extract_all(self, target_directory_path: Path, parallel: bool = True):
+        # solid blocks would be decompressed once per worker, so 7z is
+        # always extracted serially
+        self._archive_object.extractall(path=target_directory_path)  # type: ignore
+        self._archive_object.reset()  # type: ignore
 
     def extract_member(self, member_name: str, target_directory_path: Path):
         self._archive_object.extract(  # type: ignore
             targets=[member_name], path=target_directory_path
         )
+        self._archive_object.reset()  # type: ignore
+
+    def read_header(
+        self, member_name: str, nbytes: int = MEMBER_HEADER_SIZE
+    ) -> bytes:
+        # the factory stops buffering a member once it holds nbytes
+        factory = BytesIOFactory(limit=nbytes)
+        self._archive_object.extract(  # type: ignore
+            targets=[member_name], factory=factory
+        )
+        self._archive_object.reset()  # type: ignore
 
-    def add_member(self, member_path: Path):
+        if (member_file := factory.products.get(member_name)) is None:
+            return b""
+
+        member_file.seek(0)
+        return member_file.read(nbytes)
+
+    def _add_member(self, member_path: Path):
         self._archive_object.write(file=member_path, arcname=member_path.name)  # type: ignore
 
+    def copy_members_to(
+        self,
+        target_archive_object: AbstractArchiveObject,
+        member_names: list[str],
+    ):
+        target_seven_zip_file = cast(
+            SevenZipFile, target_archive_object._archive_object
+        )
+
+        # py7zr can't copy compressed data between archives, so the members
+        # are decompressed in a single pass and written to the target
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            self._archive_object.extract(  # type: ignore
+                path=temporary_directory, targets=member_names
+            )
+            self._archive_object.reset()  # type: ignore
+
+            for member_name in member_names:
+                target_seven_zip_file.write(
+                    file=Path(temporary_directory) / member_name,
+                    arcname=member_name,
+                )
+
 
 class SevenZipClient(AbsractArchiveClient):
     def open(self, file_path: Path, mode: str) -> AbstractArchiveObject:
@@ -64,5 +112,8 @@ class SevenZipMember(AbstractArchiveMember):
             archive_path=archive_path,
             name=member.filename,
             size=member.compressed,
-            mtime=member.creationtime.strftime("%a, %d %b %Y %H:%M:%S UTC"),
         )
+        self._creation_time = member.creationtime
+
+    def _get_mtime(self) -> datetime:
+        return self._creation_time
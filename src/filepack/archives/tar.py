@@ -1,8 +1,9 @@
 from datetime import datetime, timezone
 from pathlib import Path
 from tarfile import TarFile, TarInfo
-from typing import Literal, cast
+from typing import Iterator, Literal, cast
 
+from filepack.archives.consts import MEMBER_HEADER_SIZE
 from filepack.archives.models import (
     AbsractArchiveClient,
     AbstractArchiveMember,
@@ -24,24 +25,55 @@ class TarObject(AbstractArchiveObject):
         assert isinstance(self._archive_object, TarFile)
         self._archive_object = cast(TarFile, self._archive_object)
 
-    def get_members(self) -> list[AbstractArchiveMember]:
-        return [
-            TarMember(
+    def _iter_members(self) -> Iterator[AbstractArchiveMember]:
+        # iterating the TarFile reads the member headers lazily
+        for tar_info_object in self._archive_object:  # type: ignore
+            yield TarMember(
                 member=tar_info_object,
                 client=self._client,
                 archive_path=self._path,
             )
-            for tar_info_object in self._archive_object.getmembers()  # type: ignore
-        ]
+
+    def extract_all(self, target_directory_path: Path, parallel: bool = True):
+        # tar is a sequential stream, so it is always extracted serially
+        self._archive_object.extractall(path=target_directory_path)  # type: ignore
 
     def extract_member(self, member_name: str, target_directory_path: Path):
         self._archive_object.extract(  # type: ignore
             member=member_name, path=target_directory_path
         )
 
-    def add_member(self, member_path: Path):
+    def read_header(
+        self, member_name: str, nbytes: int = MEMBER_HEADER_SIZE
+    ) -> bytes:
+        member_file = self._archive_object.extractfile(member=member_name)  # type: ignore
+        if member_file is None:
+            return b""
+
+        with member_file:
+            return member_file.read(nbytes)
+
+    def _add_member(self, member_path: Path):
         self._archive_object.add(name=member_path, arcname=member_path.name)  # type: ignore
 
+    def copy_members_to(
+        self,
+        target_archive_object: AbstractArchiveObject,
+        member_names: list[str],
+    ):
+        target_tar_file = cast(TarFile, target_archive_object._archive_object)
+
+        for member_name in member_names:
+            member_info = self._archive_object.getmember(name=member_name)  # type: ignore
+            target_tar_file.addfile(
+                tarinfo=member_info,
+                fileobj=(
+                    self._archive_object.extractfile(member=member_info)  # type: ignore
+                    if member_info.isreg()
+                    else None
+                ),
+            )
+
 
 class TarClient(AbsractArchiveClient):
     def open(self, file_path: Path, mode: str) -> AbstractArchiveObject:
@@ -65,7 +97,8 @@ class TarMember(AbstractArchiveMember):
             archive_path=archive_path,
             name=member.name,
             size=member.size,
-            mtime=datetime.fromtimestamp(
-                member.mtime, tz=timezone.utc
-            ).strftime("%a, %d %b %Y %H:%M:%S UTC"),
         )
+        self._timestamp = member.mtime
+
+    def _get_mtime(self) -> datetime:
+        return datetime.fromtimestamp(self._timestamp, tz=timezone.utc)
@@ -1,14 +1,146 @@
+import io
+import os
+import shutil
+import struct
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import cast
-from zipfile import ZipFile, ZipInfo
+from typing import IO, Iterator, Optional, cast
+from zipfile import BadZipFile, ZipFile, ZipInfo
 
+from filepack.archives.consts import (
+    MEMBER_HEADER_SIZE,
+    ZIP64_DATA_DESCRIPTOR_FORMAT,
+    ZIP64_EXTRA_FIELD_ID,
+    ZIP64_LIMIT,
+    ZIP_COPY_BUFSIZE,
+    ZIP_DATA_DESCRIPTOR_FLAG,
+    ZIP_DATA_DESCRIPTOR_FORMAT,
+    ZIP_DATA_DESCRIPTOR_SIGNATURE,
+    ZIP_LOCAL_HEADER_FORMAT,
+    ZIP_LOCAL_HEADER_SIGNATURE,
+)
 from filepack.archives.models import (
     AbsractArchiveClient,
     AbstractArchiveMember,
     AbstractArchiveObject,
 )
 from filepack.archives.types import ArchiveObjectTypes
+from filepack.utils import MemoryMappedFile
+
+# the ZipFile internals compressed members are copied through. they aren't
+# public, so members are recompressed instead when one of them is missing
+_ZIP_WRITE_INTERNALS = (
+    "_lock",
+    "_seekable",
+    "_writecheck",
+    "_didModify",
+    "start_dir",
+)
+
+
+def _can_copy_compressed(
+    source_zip_file: ZipFile, target_zip_file: ZipFile
+) -> bool:
+    return (
+        hasattr(source_zip_file, "_lock")
+        and hasattr(ZipInfo, "FileHeader")
+        and all(
+            hasattr(target_zip_file, name) for name in _ZIP_WRITE_INTERNALS
+        )
+    )
+
+
+def _without_zip64_extra(extra: bytes) -> bytes:
+    # zipfile writes its own zip64 field for entries that need one
+    extra_fields = []
+    offset = 0
+    while offset + 4 <= len(extra):
+        field_id, field_size = struct.unpack_from("<HH", extra, offset)
+        field_end = offset + 4 + field_size
+        if field_id != ZIP64_EXTRA_FIELD_ID:
+            extra_fields.append(extra[offset:field_end])
+        offset = field_end
+
+    return b"".join(extra_fields)
+
+
+def _recompress_member(
+    source_zip_file: ZipFile,
+    member_info: ZipInfo,
+    target_zip_file: ZipFile,
+    target_member_info: ZipInfo,
+):
+    with source_zip_file.open(member_info) as source_file:
+        with target_zip_file.open(target_member_info, "w") as target_file:
+            shutil.copyfileobj(fsrc=source_file, fdst=target_file)  # type: ignore
+
+
+def _copy_compressed_member(
+    source_zip_file: ZipFile,
+    member_info: ZipInfo,
+    target_zip_file: ZipFile,
+    target_member_info: ZipInfo,
+):
+    # zipfile can't copy an entry without recompressing it, so its raw data
+    # is copied here, with the header written the way ZipFile.mkdir does
+    source_file = cast(IO[bytes], source_zip_file.fp)
+    target_file = cast(IO[bytes], target_zip_file.fp)
+    zip64 = (
+        member_info.file_size > ZIP64_LIMIT
+        or member_info.compress_size > ZIP64_LIMIT
+    )
+
+    with source_zip_file._lock, target_zip_file._lock:  # type: ignore[attr-defined]
+        source_file.seek(member_info.header_offset)
+        signature, *_, name_length, extra_length = struct.unpack(
+            ZIP_LOCAL_HEADER_FORMAT,
+            source_file.read(struct.calcsize(ZIP_LOCAL_HEADER_FORMAT)),
+        )
+        if signature != ZIP_LOCAL_HEADER_SIGNATURE:
+            raise BadZipFile(
+                f"Bad magic number for file header of {member_info.filename}"
+            )
+        source_file.seek(name_length + extra_length, os.SEEK_CUR)
+
+        if target_zip_file._seekable:  # type: ignore[attr-defined]
+            target_file.seek(target_zip_file.start_dir)  # type: ignore[attr-defined]
+        target_member_info.header_offset = target_file.tell()
+        target_zip_file._writecheck(target_member_info)  # type: ignore[attr-defined]
+        target_zip_file._didModify = True  # type: ignore[attr-defined]
+        target_zip_file.filelist.append(target_member_info)
+        target_zip_file.NameToInfo[
+            target_member_info.filename
+        ] = target_member_info
+        target_file.write(target_member_info.FileHeader(zip64))
+
+        remaining_size = member_info.compress_size
+        while remaining_size > 0:
+            chunk = source_file.read(min(remaining_size, ZIP_COPY_BUFSIZE))
+            if not chunk:
+                raise BadZipFile(
+                    f"Truncated compressed data of {member_info.filename}"
+                )
+            target_file.write(chunk)
+            remaining_size -= len(chunk)
+
+        # the local header of such an entry holds no sizes, so they follow
+        # its data
+        if target_member_info.flag_bits & ZIP_DATA_DESCRIPTOR_FLAG:
+            target_file.write(
+                struct.pack(
+                    (
+                        ZIP64_DATA_DESCRIPTOR_FORMAT
+                        if zip64
+                        else ZIP_DATA_DESCRIPTOR_FORMAT
+                    ),
+                    ZIP_DATA_DESCRIPTOR_SIGNATURE,
+                    member_info.CRC,
+                    member_info.compress_size,
+                    member_info.file_size,
+                )
+            )
+
+        target_zip_file.start_dir = target_file.tell()  # type: ignore[attr-defined]
 
 
 class ZipObject(AbstractArchiveObject):
@@ -17,40 +149,117 @@ class ZipObject(AbstractArchiveObject):
         archive_object: ArchiveObjectTypes,
         client: AbsractArchiveClient,
         archive_path: Path,
+        source_file: Optional[io.IOBase] = None,
     ) -> None:
         super().__init__(
-            archive_object=archive_object, client=client, path=archive_path
+            archive_object=archive_object,
+            client=client,
+            path=archive_path,
+            source_file=source_file,
         )
         assert isinstance(self._archive_object, ZipFile)
         self._archive_object = cast(ZipFile, self._archive_object)
 
-    def get_members(self) -> list[AbstractArchiveMember]:
-        return [
-            ZipMember(
+    def _iter_members(self) -> Iterator[AbstractArchiveMember]:
+        for zip_info_object in self._archive_object.infolist():  # type: ignore
+            yield ZipMember(
                 member=zip_info_object,
                 client=self._client,
                 archive_path=self._path,
             )
-            for zip_info_object in self._archive_object.infolist()  # type: ignore
-        ]
+
+    def extract_all(self, target_directory_path: Path, parallel: bool = True):
+        if parallel:
+            self._extract_members_in_parallel(
+                member_names=self._archive_object.namelist(),  # type: ignore
+                target_directory_path=target_directory_path,
+            )
+        else:
+            self._archive_object.extractall(path=target_directory_path)  # type: ignore
 
     def extract_member(self, member_name: str, target_directory_path: Path):
         self._archive_object.extract(  # type: ignore
             member=member_name, path=target_directory_path
         )
 
-    def add_member(self, member_path: Path):
+    def read_header(
+        self, member_name: str, nbytes: int = MEMBER_HEADER_SIZE
+    ) -> bytes:
+        with self._archive_object.open(name=member_name) as member_file:  # type: ignore
+            return member_file.read(nbytes)  # type: ignore
+
+    def _add_member(self, member_path: Path):
         self._archive_object.write(  # type: ignore
             filename=member_path, arcname=member_path.name
         )
 
+    def copy_members_to(
+        self,
+        target_archive_object: AbstractArchiveObject,
+        member_names: list[str],
+    ):
+        source_zip_file = cast(ZipFile, self._archive_object)
+        target_zip_file = cast(ZipFile, target_archive_object._archive_object)
+
+        for member_name in member_names:
+            member_info = source_zip_file.getinfo(member_name)
+
+            target_member_info = ZipInfo(
+                filename=member_info.filename, date_time=member_info.date_time
+            )
+            target_member_info.compress_type = member_info.compress_type
+            target_member_info.create_system = member_info.create_system
+            target_member_info.external_attr = member_info.external_attr
+            target_member_info.extra = _without_zip64_extra(member_info.extra)
+            target_member_info.comment = member_info.comment
+            target_member_info.file_size = member_info.file_size
+
+            if member_info.is_dir():
+                target_member_info.CRC = target_member_info.compress_size = 0
+                target_zip_file.mkdir(target_member_info)
+                continue
+
+            if not _can_copy_compressed(
+                source_zip_file=source_zip_file,
+                target_zip_file=target_zip_file,
+            ):
+                _recompress_member(
+                    source_zip_file=source_zip_file,
+                    member_info=member_info,
+                    target_zip_file=target_zip_file,
+                    target_member_info=target_member_info,
+                )
+                continue
+
+            # the entry keeps its compressed bytes, so neither the data nor
+            # its original compression level change. its flags are kept too,
+            # since encrypted entries check their password against the time
+            # or the CRC depending on the data descriptor flag
+            target_member_info.CRC = member_info.CRC
+            target_member_info.compress_size = member_info.compress_size
+            target_member_info.flag_bits = member_info.flag_bits
+            _copy_compressed_member(
+                source_zip_file=source_zip_file,
+                member_info=member_info,
+                target_zip_file=target_zip_file,
+                target_member_info=target_member_info,
+            )
+
 
 class ZipClient(AbsractArchiveClient):
     def open(self, file_path: Path, mode: str) -> AbstractArchiveObject:
+        # read-only archives are memory mapped, so reads of the central
+        # directory and members don't go through read() syscalls
+        source_file = MemoryMappedFile(path=file_path) if mode == "r" else None
+
         return ZipObject(
-            archive_object=ZipFile(file=file_path, mode=mode),  # type: ignore
+            archive_object=ZipFile(
+                file=source_file if source_file is not None else file_path,
+                mode=mode,  # type: ignore
+            ),
             client=self,
             archive_path=file_path,
+            source_file=source_file,
         )
 
 
@@ -63,7 +272,8 @@ class ZipMember(AbstractArchiveMember):
             archive_path=archive_path,
             name=member.filename,
             size=member.file_size,
-            mtime=datetime.fromtimestamp(
-                datetime(*member.date_time).timestamp(), tz=timezone.utc
-            ).strftime("%a, %d %b %Y %H:%M:%S UTC"),
         )
+        self._date_time = member.date_time
+
+    def _get_mtime(self) -> datetime:
+        return datetime(*self._date_time, tzinfo=timezone.utc)
@@ -1,9 +1,21 @@
+from __future__ import annotations
+
+import io
 import os
-import shutil
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import IO, Callable, Iterable
 
 from filepack.compressions.bzip2 import BzipCompression
+from filepack.compressions.consts import (
+    COMPRESSION_WORKERS_ENV,
+    COPY_BUFSIZE,
+    DEFAULT_COMPRESSION_WORKERS,
+    GZIP_SUFFIX,
+    LZ4_SUFFIX,
+    MAGIC_NUMBERS,
+    SMALL_INPUT_LEVEL_CAPS,
+)
 from filepack.compressions.exceptions import (
     CompressionTypeNotSupported,
     FailedToCompressFile,
@@ -15,9 +27,46 @@ from filepack.compressions.exceptions import (
 )
 from filepack.compressions.gzip import GzipCompression
 from filepack.compressions.lz4 import LZ4Compression
-from filepack.compressions.models import AbstractCompression, CompressionType
+from filepack.compressions.models import SUFFIX_TO_TYPE, CompressionType
+from filepack.compressions.types import CompressionObjectTypes
 from filepack.compressions.xz import XZCompression
-from filepack.utils import get_file_type_extension, reraise_as
+from filepack.utils import copy_file_object, read_magic, reraise_as
+
+# the clients are stateless, so the open method of a single instance of each
+# is shared
+COMPRESSION_OPENERS: dict[
+    CompressionType, Callable[..., CompressionObjectTypes]
+] = {
+    CompressionType.GZIP: GzipCompression().open,
+    CompressionType.BZ2: BzipCompression().open,
+    CompressionType.LZ4: LZ4Compression().open,
+    CompressionType.XZ: XZCompression().open,
+}
+
+
+def _level_for_size(size: int, compression_level: int) -> int:
+    for max_size, level_cap in SMALL_INPUT_LEVEL_CAPS:
+        if size < max_size:
+            return min(compression_level, level_cap)
+
+    return compression_level
+
+
+class _CountingSink(io.RawIOBase):
+    """A writable file object that discards its input and only counts its size."""
+
+    def __init__(self, name: str = "") -> None:
+        super().__init__()
+        self.name = name
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # type: ignore[override]
+        written = memoryview(data).nbytes
+        self.size += written
+        return written
 
 
 class Compression:
@@ -63,12 +112,11 @@ class Compression:
         if not self.is_compressed(compression_algorithm=compression_algorithm):
             return self._path.stat().st_size
 
-        with tempfile.NamedTemporaryFile() as temporary_file:
-            self.decompress(
-                target_path=temporary_file.name,
-                compression_algorithm=compression_algorithm,
-            )
-            return Path(temporary_file.name).stat().st_size
+        sink = _CountingSink()
+        self._decompress_to(
+            target_file=sink, compression_algorithm=compression_algorithm
+        )
+        return sink.size
 
     @reraise_as(FailedToGetCompressedSize)
     def compressed_size(
@@ -82,7 +130,8 @@ class Compression:
             compression_level: The level of compression to apply if compressing the file.
 
         Returns:
-            The compressed file size in bytes.
+            The compressed file size in bytes, the size compress() writes to
+            its default target path.
 
         Raises:
             FailedToGetCompressedSize: If there's an error while retrieving the compressed size.
@@ -95,13 +144,15 @@ class Compression:
                 "compression_level is manadatory for calculating compressed file size"
             )
 
-        with tempfile.NamedTemporaryFile() as temporary_file:
-            self.compress(
-                target_path=temporary_file.name,
-                compression_algorithm=compression_algorithm,
-                compression_level=compression_level,
-            )
-            return Path(temporary_file.name).stat().st_size
+        # gzip stores the target's file name in its header, so the sink is
+        # named like compress()'s default target
+        sink = _CountingSink(name=f"{self._path.name}.{compression_algorithm}")
+        self._compress_to(
+            target_file=sink,
+            compression_algorithm=compression_algorithm,
+            compression_level=compression_level,
+        )
+        return sink.size
 
     def compression_ratio(self, compression_algorithm: str) -> str:
         """
@@ -151,15 +202,13 @@ class Compression:
         else:
             target_path = Path(target_path)
 
-        compression_client = self._get_compression_client(
-            compression_algorithm=compression_algorithm
-        )
-
-        with compression_client.open(
-            file_path=self._path, mode="r"
-        ) as compression_object:
-            with open(file=target_path, mode="wb") as target_file:
-                shutil.copyfileobj(fsrc=compression_object, fdst=target_file)
+        with open(
+            file=target_path, mode="wb", buffering=COPY_BUFSIZE
+        ) as target_file:
+            self._decompress_to(
+                target_file=target_file,
+                compression_algorithm=compression_algorithm,
+            )
 
         if in_place:
             self._path.unlink()
@@ -173,7 +222,7 @@ class Compression:
         compression_algorithm: str,
         target_path: str | Path | None = None,
         in_place: bool = False,
-        compression_level: int = 9,
+        compression_level: int | None = None,
     ) -> Path:
         """
         Compresses the file using the specified algorithm and compression level.
@@ -182,7 +231,7 @@ class Compression:
             compression_algorithm: The algorithm used for compression.
             target_path: The path where the compressed file will be saved. If None, adds the algorithm as a suffix.
             in_place: If True, replaces the original file with the compressed version.
-            compression_level: The level of compression to apply, where 9 is maximum compression.
+            compression_level: The level of compression to apply. If None, the algorithm's default level is used. Given levels are lowered for small GZIP and LZ4 inputs.
 
         Returns:
             The path to the compressed file.
@@ -202,23 +251,15 @@ class Compression:
         else:
             target_path = Path(target_path)
 
-        compression_client = self._get_compression_client(
-            compression_algorithm=compression_algorithm
+        self._compress_to(
+            target_file=target_path,
+            compression_algorithm=compression_algorithm,
+            compression_level=compression_level,
         )
 
-        with open(file=self._path, mode="rb") as uncompressed_file:
-            with compression_client.open(
-                file_path=target_path,
-                mode="wb",
-                compression_level=compression_level,
-            ) as compressed_file:
-                shutil.copyfileobj(
-                    fsrc=uncompressed_file, fdst=compressed_file
-                )
-
-            if in_place:
-                os.remove(self._path)
-                self._path = target_path
+        if in_place:
+            os.remove(self._path)
+            self._path = target_path
 
         return self._path
 
@@ -232,28 +273,110 @@ class Compression:
         Returns:
             True if the file is compressed with the specified algorithm, otherwise False.
         """
-        try:
-            return get_file_type_extension(self._path) == compression_algorithm
-        except ValueError:
+        # a single read of the file's start serves every algorithm
+        if (magic_number := MAGIC_NUMBERS.get(compression_algorithm)) is None:
             return False
 
-    def _get_compression_client(
+        return read_magic(path=self._path).startswith(magic_number)
+
+    def _decompress_to(
+        self, target_file: IO[bytes] | io.IOBase, compression_algorithm: str
+    ):
+        open_compressed = self._get_compression_opener(
+            compression_algorithm=compression_algorithm
+        )
+
+        with open_compressed(
+            file_path=self._path, mode="r"
+        ) as compression_object:
+            copy_file_object(
+                source=compression_object,
+                target=target_file,
+                buffer_size=COPY_BUFSIZE,
+            )
+
+    def _compress_to(
+        self,
+        target_file: Path | io.IOBase,
+        compression_algorithm: str,
+        compression_level: int | None = None,
+    ):
+        open_compressed = self._get_compression_opener(
+            compression_algorithm=compression_algorithm
+        )
+
+        with open(
+            file=self._path, mode="rb", buffering=COPY_BUFSIZE
+        ) as uncompressed_file:
+            # without a level, each codec's own default applies
+            level_argument = {}
+            if compression_level is not None:
+                if compression_algorithm in (GZIP_SUFFIX, LZ4_SUFFIX):
+                    compression_level = _level_for_size(
+                        size=os.fstat(uncompressed_file.fileno()).st_size,
+                        compression_level=compression_level,
+                    )
+                level_argument["compression_level"] = compression_level
+
+            with open_compressed(
+                file_path=target_file, mode="wb", **level_argument
+            ) as compressed_file:
+                copy_file_object(
+                    source=uncompressed_file,
+                    target=compressed_file,
+                    buffer_size=COPY_BUFSIZE,
+                )
+
+    def _get_compression_opener(
         self, compression_algorithm: str
-    ) -> AbstractCompression:
-        try:
-            match CompressionType(compression_algorithm):
-                case CompressionType.GZIP:
-                    return GzipCompression()
-
-                case CompressionType.BZ2:
-                    return BzipCompression()
-
-                case CompressionType.LZ4:
-                    return LZ4Compression()
-
-                case CompressionType.XZ:
-                    return XZCompression()
-                case _:
-                    raise CompressionTypeNotSupported()
-        except Exception:
+    ) -> Callable[..., CompressionObjectTypes]:
+        compression_type = SUFFIX_TO_TYPE.get(compression_algorithm)
+
+        if compression_type is None:
             raise CompressionTypeNotSupported()
+
+        return COMPRESSION_OPENERS[compression_type]
+
+
+def compress_files(
+    paths: Iterable[str | Path],
+    compression_algorithm: str,
+    in_place: bool = False,
+    compression_level: int | None = None,
+) -> list[Path]:
+    """
+    Compresses several files concurrently, each into its own compressed file next to it.
+
+    The codecs release the GIL while compressing, so the files are compressed
+    on a thread pool whose size is read from the COMPRESSION_WORKERS
+    environment variable, defaulting to 4.
+
+    Args:
+        paths: The paths to the files to compress.
+        compression_algorithm: The algorithm used for compression.
+        in_place: If True, replaces the original files with their compressed versions.
+        compression_level: The level of compression to apply. If None, the algorithm's default level is used.
+
+    Returns:
+        The paths to the compressed files, in the order of the given paths.
+
+    Raises:
+        FileNotFoundError: If one of the given paths does not exist.
+        FailedToCompressFile: If there's an error while compressing one of the files.
+    """
+    compressions = [Compression(path=path) for path in paths]
+    workers_count = int(
+        os.environ.get(COMPRESSION_WORKERS_ENV, DEFAULT_COMPRESSION_WORKERS)
+    )
+
+    with ThreadPoolExecutor(max_workers=workers_count) as executor:
+        return list(
+            executor.map(
+                lambda compression: compression.compress(
+                    compression_algorithm=compression_algorithm,
+                    in_place=in_place,
+                    compression_level=compression_level,
+                ),
+                compressions,
+            )
+        )
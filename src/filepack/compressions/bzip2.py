@@ -1,8 +1,116 @@
+from __future__ import annotations
+
 import bz2
+import io
+import os
+import shutil
+import subprocess
+import threading
 from pathlib import Path
-from typing import TextIO
+from typing import Any, BinaryIO, TextIO
+
+from filepack.compressions.consts import COPY_BUFSIZE, USE_PBZIP2_ENV
+from filepack.compressions.models import (
+    AbstractCompression,
+    MappedSourceFile,
+    buffer_file_object,
+    is_regular_file,
+    map_source,
+)
+
+try:
+    import indexed_bzip2
+except ImportError:
+    indexed_bzip2 = None
+
+
+class Pbzip2File(io.RawIOBase):
+    """A writable file object that compresses its input on all cores with an external pbzip2 process."""
+
+    def __init__(
+        self,
+        executable: str,
+        file_path: str | Path | io.IOBase,
+        compression_level: int,
+    ) -> None:
+        # a target file object is fed from a pipe on a thread, so pbzip2
+        # never blocks on a full pipe while its input is still being written
+        self._target_file = (
+            open(file_path, "wb")
+            if isinstance(file_path, (str, Path))
+            else None
+        )
+        try:
+            self._process = subprocess.Popen(
+                [
+                    executable,
+                    f"-p{os.cpu_count() or 1}",
+                    f"-{compression_level}",
+                    "-c",
+                ],
+                stdin=subprocess.PIPE,
+                stdout=(
+                    self._target_file
+                    if self._target_file is not None
+                    else subprocess.PIPE
+                ),
+            )
+        except BaseException:
+            if self._target_file is not None:
+                self._target_file.close()
+                os.remove(file_path)  # type: ignore[arg-type]
+            raise
+
+        self._output_error: BaseException | None = None
+        self._output_thread: threading.Thread | None = None
+        if self._target_file is None:
+            self._output_thread = threading.Thread(
+                target=self._copy_output, args=(file_path,), daemon=True
+            )
+            self._output_thread.start()
+
+    def _copy_output(self, target: io.IOBase) -> None:
+        assert self._process.stdout is not None
+        try:
+            shutil.copyfileobj(fsrc=self._process.stdout, fdst=target)
+        except BaseException as e:
+            self._output_error = e
+            # the rest of the output is drained, so pbzip2 can still exit
+            while self._process.stdout.read(COPY_BUFSIZE):
+                pass
 
-from filepack.compressions.models import AbstractCompression
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        assert self._process.stdin is not None
+        self._process.stdin.write(data)
+        return len(data)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+
+        try:
+            assert self._process.stdin is not None
+            self._process.stdin.close()
+            if self._output_thread is not None:
+                self._output_thread.join()
+            return_code = self._process.wait()
+            if self._output_error is not None:
+                raise self._output_error
+            if return_code != 0:
+                raise OSError(f"pbzip2 exited with return code {return_code}")
+        finally:
+            if self._target_file is not None:
+                self._target_file.close()
+            if self._process.stdout is not None:
+                self._process.stdout.close()
+            super().close()
+
+
+class MappedBZ2File(MappedSourceFile, bz2.BZ2File):  # type: ignore[misc]
+    pass
 
 
 class BzipCompression(AbstractCompression):
@@ -10,22 +118,56 @@ class BzipCompression(AbstractCompression):
 
     def open(
         self,
-        file_path: str | Path,
+        file_path: str | Path | io.IOBase,
         mode: str = "r",
         compression_level=9,
-    ) -> bz2.BZ2File | TextIO:
+    ) -> bz2.BZ2File | io.BufferedWriter | BinaryIO | TextIO:
         """Opens a file with bzip2 compression.
 
+        When indexed_bzip2 is installed, files opened for binary reading are
+        decompressed in parallel on all available cores. When the USE_PBZIP2
+        environment variable is set to 1 and pbzip2 is on the PATH, files
+        opened for binary writing are compressed by it on all available
+        cores.
+
         Args:
-            file_path: The path to the file.
+            file_path: The path to the file, or a binary file object.
             mode: The mode in which to open the file. Defaults to 'r' for reading.
             compression_level: The compression level, defaults to 9 for maximum compression.
 
         Returns:
-            A BZ2File object that can be used to read or write to the file.
+            A file object that can be used to read or write to the file.
         """
-        return bz2.open(
-            filename=file_path,
-            mode=mode,
-            compresslevel=compression_level,
+        if (
+            indexed_bzip2 is not None
+            and mode in ("r", "rb")
+            and is_regular_file(file_path)
+        ):
+            return buffer_file_object(
+                indexed_bzip2.open(
+                    str(file_path), parallelization=os.cpu_count() or 1
+                ),
+                mode,
+            )
+
+        if (
+            mode in ("w", "wb")
+            and os.environ.get(USE_PBZIP2_ENV) == "1"
+            and (pbzip2_executable := shutil.which("pbzip2"))
+        ):
+            return buffer_file_object(
+                Pbzip2File(
+                    executable=pbzip2_executable,
+                    file_path=file_path,
+                    compression_level=compression_level,
+                ),
+                mode,
+            )
+
+        if (source := map_source(file_path=file_path, mode=mode)) is not None:
+            return buffer_file_object(MappedBZ2File(source), mode)
+
+        return buffer_file_object(
+            bz2.open(file_path, mode, compression_level),
+            mode,
         )
@@ -1,6 +1,38 @@
+from __future__ import annotations
+
 from typing import Final
 
 GZIP_SUFFIX: Final[str] = "gz"
 BZ2_SUFFIX: Final[str] = "bz2"
 LZ4_SUFFIX: Final[str] = "lz4"
 XZ_SUFFIX: Final[str] = "xz"
+
+# buffer size used when streaming data in and out of a compressor
+COPY_BUFSIZE: Final[int] = 4 * 1024 * 1024
+
+# buffer size of the file objects returned by the compression clients
+FILE_BUFFER_SIZE: Final[int] = 256 * 1024
+
+# inputs smaller than these sizes gain next to nothing from high gzip and lz4
+# levels, so their level is capped at the paired value
+SMALL_INPUT_LEVEL_CAPS: Final[tuple[tuple[int, int], ...]] = (
+    (4 * 1024, 1),
+    (64 * 1024, 3),
+)
+
+# environment variable that sets the amount of files compressed concurrently
+COMPRESSION_WORKERS_ENV: Final[str] = "COMPRESSION_WORKERS"
+DEFAULT_COMPRESSION_WORKERS: Final[int] = 4
+
+# environment variable that, when set to 1, compresses bz2 files with pbzip2
+# from the PATH. pbzip2 writes one bzip2 stream per block, so its output
+# differs from the bz2 module's
+USE_PBZIP2_ENV: Final[str] = "USE_PBZIP2"
+
+# magic numbers at the start of files compressed with each algorithm
+MAGIC_NUMBERS: Final[dict[str, bytes]] = {
+    GZIP_SUFFIX: b"\x1f\x8b",
+    BZ2_SUFFIX: b"BZh",
+    LZ4_SUFFIX: b"\x04\x22\x4d\x18",
+    XZ_SUFFIX: b"\xfd7zXZ\x00",
+}
@@ -1,8 +1,36 @@
+from __future__ import annotations
+
 import gzip
+import io
+import os
 from pathlib import Path
-from typing import TextIO
+from typing import BinaryIO, TextIO
+
+from filepack.compressions.models import (
+    AbstractCompression,
+    MappedSourceFile,
+    buffer_file_object,
+    is_regular_file,
+    map_source,
+)
+from filepack.utils import MemoryMappedFile
+
+try:
+    import rapidgzip
+except ImportError:
+    rapidgzip = None
+
+try:
+    from isal import igzip, igzip_threaded
+except ImportError:
+    igzip = igzip_threaded = None  # type: ignore[assignment]
+
 
-from filepack.compressions.models import AbstractCompression
+class MappedGzipFile(MappedSourceFile, gzip.GzipFile):
+    def __init__(self, source: MemoryMappedFile) -> None:
+        # GzipFile only takes a file object through its fileobj argument
+        self._source = source
+        gzip.GzipFile.__init__(self, fileobj=source, mode="rb")
 
 
 class GzipCompression(AbstractCompression):
@@ -10,22 +38,60 @@ class GzipCompression(AbstractCompression):
 
     def open(
         self,
-        file_path: str | Path,
+        file_path: str | Path | io.IOBase,
         mode: str = "r",
-        compression_level=9,
-    ) -> gzip.GzipFile | TextIO:
+        compression_level=6,
+    ) -> gzip.GzipFile | BinaryIO | TextIO:
         """Opens a file with gzip compression.
 
+        When rapidgzip is installed, files opened for binary reading are
+        decompressed in parallel on all available cores. When isal is
+        installed, files opened for writing are compressed with ISA-L, and
+        files opened for reading are decompressed on background threads if
+        rapidgzip is missing.
+
         Args:
-            file_path: The path to the file.
+            file_path: The path to the file, or a binary file object.
             mode: The mode in which to open the file. Defaults to 'r' for reading.
-            compression_level: The compression level, defaults to 9 for maximum compression.
+            compression_level: The compression level, defaults to 6 for a balance of speed and size.
 
         Returns:
-            A GzipFile object that can be used to read or write to the file.
+            A file object that can be used to read or write to the file.
         """
-        return gzip.open(
-            filename=file_path,
-            mode=mode,
-            compresslevel=compression_level,
+        if (
+            rapidgzip is not None
+            and mode in ("r", "rb")
+            and is_regular_file(file_path)
+        ):
+            return buffer_file_object(
+                rapidgzip.open(
+                    str(file_path), parallelization=os.cpu_count() or 1
+                ),
+                mode,
+            )
+
+        if igzip_threaded is not None and mode in ("r", "rb"):
+            return buffer_file_object(
+                igzip_threaded.open(
+                    file_path, "rb", threads=min(os.cpu_count() or 1, 4)
+                ),
+                mode,
+            )
+
+        if igzip is not None and "w" in mode:
+            # isa-l has levels 0 to 3, and its level 3 compresses about as
+            # well as zlib's level 6
+            return buffer_file_object(
+                igzip.open(
+                    file_path, mode, compresslevel=min(compression_level, 3)
+                ),
+                mode,
+            )
+
+        if (source := map_source(file_path=file_path, mode=mode)) is not None:
+            return buffer_file_object(MappedGzipFile(source), mode)
+
+        return buffer_file_object(
+            gzip.open(file_path, mode, compression_level),
+            mode,
         )
@@ -1,9 +1,21 @@
+from __future__ import annotations
+
+import io
 from pathlib import Path
 from typing import TextIO
 
 import lz4.frame
 
-from filepack.compressions.models import AbstractCompression
+from filepack.compressions.models import (
+    AbstractCompression,
+    MappedSourceFile,
+    buffer_file_object,
+    map_source,
+)
+
+
+class MappedLZ4FrameFile(MappedSourceFile, lz4.frame.LZ4FrameFile):
+    pass
 
 
 class LZ4Compression(AbstractCompression):
@@ -11,22 +23,26 @@ class LZ4Compression(AbstractCompression):
 
     def open(
         self,
-        file_path: str | Path,
+        file_path: str | Path | io.IOBase,
         mode: str = "r",
-        compression_level=9,
+        compression_level=0,
     ) -> lz4.frame.LZ4FrameFile | TextIO:
         """Opens a file with LZ4 compression.
 
         Args:
-            file_path: The path to the file.
+            file_path: The path to the file, or a binary file object.
             mode: The mode in which to open the file. Defaults to 'r'.
-            compression_level: The compression level, with 9 being the default high compression preset.
+            compression_level: The compression level, defaults to 0. 0 to 2 is fast LZ4, 3 to 16 is LZ4HC, which compresses much slower for a slightly better ratio.
 
         Returns:
             An LZ4FrameFile object that can be used to read or write to the file.
         """
-        return lz4.frame.open(
-            filename=file_path,
-            mode=mode,
-            compression_level=compression_level,
+        if (source := map_source(file_path=file_path, mode=mode)) is not None:
+            return buffer_file_object(MappedLZ4FrameFile(source), mode)
+
+        return buffer_file_object(
+            lz4.frame.open(
+                file_path, mode, compression_level=compression_level
+            ),
+            mode,
         )
@@ -1,14 +1,22 @@
+from __future__ import annotations
+
+import io
+import os
+import stat
 from abc import ABC, abstractmethod
 from enum import Enum
 from pathlib import Path
+from typing import Any, Optional
 
 from filepack.compressions.consts import (
     BZ2_SUFFIX,
+    FILE_BUFFER_SIZE,
     GZIP_SUFFIX,
     LZ4_SUFFIX,
     XZ_SUFFIX,
 )
 from filepack.compressions.types import CompressionObjectTypes
+from filepack.utils import MemoryMappedFile
 
 
 class CompressionType(Enum):
@@ -20,21 +28,79 @@ class CompressionType(Enum):
     BZ2 = BZ2_SUFFIX
 
 
+SUFFIX_TO_TYPE: dict[str, CompressionType] = {
+    compression_type.value: compression_type
+    for compression_type in CompressionType
+}
+
+
 class AbstractCompression(ABC):
     """Abstract base class for different compression types."""
 
     @abstractmethod
     def open(
         self,
-        file_path: str | Path,
+        file_path: str | Path | io.IOBase,
         mode: str = "rb",
         compression_level: int = 9,
     ) -> CompressionObjectTypes:
         """Opens the compression file with the given mode and compression level.
 
         Args:
-            file_path: The path to the file.
+            file_path: The path to the file, or a binary file object.
             mode: The mode in which to open the file.
             compression_level: The level of compression.
         """
         pass
+
+
+def buffer_file_object(file_object: Any, mode: str) -> Any:
+    # the stdlib codecs are buffered already, so only raw binary file objects
+    # get wrapped
+    if "t" in mode or isinstance(file_object, io.BufferedIOBase):
+        return file_object
+
+    if "r" in mode:
+        return io.BufferedReader(file_object, buffer_size=FILE_BUFFER_SIZE)
+
+    return io.BufferedWriter(file_object, buffer_size=FILE_BUFFER_SIZE)
+
+
+class MappedSourceFile:
+    """A mixin for codec file classes that read the compressed file through a memory map, unmapping it on close."""
+
+    def __init__(self, source: MemoryMappedFile, *args: Any, **kwargs: Any):
+        self._source = source
+        super().__init__(source, *args, **kwargs)  # type: ignore[call-arg]
+
+    def close(self) -> None:
+        try:
+            super().close()  # type: ignore[misc]
+        finally:
+            self._source.close()
+
+
+def is_regular_file(file_path: str | Path | io.IOBase) -> bool:
+    # the memory map and the parallel readers need a seekable file of known
+    # size, which pipes and devices aren't
+    if not isinstance(file_path, (str, Path)):
+        return False
+
+    try:
+        return stat.S_ISREG(os.stat(file_path).st_mode)
+    except OSError:
+        return False
+
+
+def map_source(
+    file_path: str | Path | io.IOBase, mode: str
+) -> Optional[MemoryMappedFile]:
+    # only binary reads of regular files are mapped. other files go through
+    # the codec's own opener, and empty files can't be mapped at all
+    if mode not in ("r", "rb") or not is_regular_file(file_path):
+        return None
+
+    try:
+        return MemoryMappedFile(path=Path(file_path))  # type: ignore[arg-type]
+    except (OSError, ValueError):
+        return None
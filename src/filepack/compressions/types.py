@@ -1,8 +1,14 @@
-from bz2 import BZ2File
-from gzip import GzipFile
-from lzma import LZMAFile
-from typing import Union
+from __future__ import annotations
 
-from lz4.frame import LZ4FrameFile
+from typing import TYPE_CHECKING, Union
 
-CompressionObjectTypes = Union[GzipFile, LZ4FrameFile, LZMAFile, BZ2File]
+if TYPE_CHECKING:
+    from bz2 import BZ2File
+    from gzip import GzipFile
+    from lzma import LZMAFile
+
+    from lz4.frame import LZ4FrameFile
+
+CompressionObjectTypes = Union[
+    "GzipFile", "LZ4FrameFile", "LZMAFile", "BZ2File"
+]
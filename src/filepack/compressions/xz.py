@@ -1,8 +1,20 @@
+from __future__ import annotations
+
+import io
 import lzma
 from pathlib import Path
 from typing import TextIO
 
-from filepack.compressions.models import AbstractCompression
+from filepack.compressions.models import (
+    AbstractCompression,
+    MappedSourceFile,
+    buffer_file_object,
+    map_source,
+)
+
+
+class MappedLZMAFile(MappedSourceFile, lzma.LZMAFile):  # type: ignore[misc]
+    pass
 
 
 class XZCompression(AbstractCompression):
@@ -10,20 +22,26 @@ class XZCompression(AbstractCompression):
 
     def open(
         self,
-        file_path: str | Path,
+        file_path: str | Path | io.IOBase,
         mode: str = "r",
         compression_level=None,
     ) -> lzma.LZMAFile | TextIO:
         """Opens a file with XZ compression.
 
         Args:
-            file_path: The path to the file.
+            file_path: The path to the file, or a binary file object.
             mode: The mode in which to open the file. Defaults to 'r'.
             compression_level: The compression level. If None, the default is used.
 
         Returns:
             An LZMAFile object that can be used to read or write to the file.
         """
-        return lzma.open(
-            filename=file_path, mode=mode, preset=compression_level
+        if (source := map_source(file_path=file_path, mode=mode)) is not None:
+            return buffer_file_object(MappedLZMAFile(source), mode)
+
+        return buffer_file_object(
+            lzma.open(
+                file_path, mode, preset=compression_level  # type: ignore[arg-type]
+            ),
+            mode,
         )
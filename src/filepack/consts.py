@@ -1,5 +1,10 @@
+from __future__ import annotations
+
 from typing import Final
 
 ERROR_MESSAGE_NOT_SUPPORTED: Final[
     str
 ] = "the given file inferred type is not supported"
+
+# the amount of bytes read from the start of a file to check its magic number
+MAGIC_NUMBER_SIZE: Final[int] = 16
@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from pathlib import Path
 
 from filepack.archive import Archive
@@ -8,20 +10,17 @@ class FilePack(Archive, Compression):
     """Provides a unified interface for interacting with archive and compression operations."""
 
     def __init__(self, path: str | Path) -> None:
-        errors: list[Exception] = []
-
+        # a path that is usable as an archive needs no further checks
         try:
             Archive.__init__(self, path)
+            return
         except ValueError as e:
-            errors.append(e)
+            archive_error = e
 
         try:
             Compression.__init__(self, path)
         except FileNotFoundError as e:
-            errors.append(e)
-
-        if len(errors) == 2:
             raise ExceptionGroup(
                 "the given path can't be used for archiving or compression",
-                errors,
+                [archive_error, e],
             )
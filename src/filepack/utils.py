@@ -1,8 +1,101 @@
-from functools import wraps
+from __future__ import annotations
+
+import errno
+import io
+import mmap
+import os
+import shutil
+from functools import lru_cache, wraps
 from pathlib import Path
 from typing import Any, Callable, Optional, Type
 
-import filetype
+from filepack.archives.consts import SEVEN_ZIP_SUFFIX, TAR_SUFFIX, ZIP_SUFFIX
+from filepack.compressions.consts import (
+    BZ2_SUFFIX,
+    GZIP_SUFFIX,
+    LZ4_SUFFIX,
+    XZ_SUFFIX,
+)
+from filepack.consts import MAGIC_NUMBER_SIZE
+
+# suffixes that identify a file type without inspecting the file's content
+_SUFFIX_TO_EXT: dict[str, str] = {
+    f".{extension}": extension
+    for extension in (
+        GZIP_SUFFIX,
+        XZ_SUFFIX,
+        LZ4_SUFFIX,
+        BZ2_SUFFIX,
+        ZIP_SUFFIX,
+        TAR_SUFFIX,
+        SEVEN_ZIP_SUFFIX,
+    )
+}
+
+
+class MemoryMappedFile(io.RawIOBase):
+    """A read-only, seekable file object backed by a memory map of a whole file."""
+
+    def __init__(self, path: Path) -> None:
+        """
+        Maps the given file into memory.
+
+        Args:
+            path: The path to the file to map.
+
+        Raises:
+            ValueError: If the file is empty, since empty files can't be mapped.
+        """
+        with open(path, "rb") as file:
+            self._mapping = mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        self.name = str(path)
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        start = self._position
+        end = len(self._mapping) if size is None or size < 0 else start + size
+        data = self._mapping[start:end]
+        self._position += len(data)
+        return data
+
+    def readinto(self, buffer: Any) -> int:
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        match whence:
+            case io.SEEK_SET:
+                position = offset
+            case io.SEEK_CUR:
+                position = self._position + offset
+            case io.SEEK_END:
+                position = len(self._mapping) + offset
+            case _:
+                raise ValueError(f"invalid whence ({whence})")
+
+        # behave like a regular file, which raises OSError (EINVAL) here
+        if position < 0:
+            raise OSError(errno.EINVAL, os.strerror(errno.EINVAL))
+
+        self._position = position
+        return position
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self) -> None:
+        if not self.closed:
+            self._mapping.close()
+        super().close()
 
 
 def reraise_as(
@@ -15,7 +108,7 @@ def reraise_as(
 
     Returns:
         A decorated function that, when it catches any exception,
-        will re-raise it as the given exception_class with the original message and traceback.
+        will re-raise it as the given exception_class, holding the original exception as its argument and cause.
     """
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
@@ -24,16 +117,42 @@ def reraise_as(
             try:
                 return func(*args, **kwargs)
             except Exception as e:
-                raise exception_class(f"an error occurred: {str(e)}") from e
+                # the original exception is only rendered if the new one is
+                raise exception_class(e) from e
 
         return wrapper
 
     return decorator
 
 
+def copy_file_object(source: Any, target: Any, buffer_size: int) -> None:
+    """Copies the content of a file object into another through a single reused buffer.
+
+    Args:
+        source: The file object to read from.
+        target: The file object to write to.
+        buffer_size: The size of the chunks to copy.
+    """
+    if not hasattr(source, "readinto"):
+        shutil.copyfileobj(fsrc=source, fdst=target, length=buffer_size)
+        return
+
+    # refilling one buffer in place avoids allocating a new bytes object for
+    # every chunk. the buffer lives only as long as the copy, so the pool
+    # threads that copy don't each hold on to one afterwards
+    buffer = memoryview(bytearray(buffer_size))
+
+    while read_size := source.readinto(buffer):
+        target.write(buffer[:read_size])
+
+
 def get_file_type_extension(path: Path) -> Optional[str]:
     """Determines the file type of a given file and returns its extension.
 
+    A known suffix is trusted without inspecting the file. Otherwise, the
+    result is reused for as long as the file's modification time and size
+    are unchanged.
+
     Args:
         path: The filesystem path to the file.
 
@@ -43,6 +162,67 @@ def get_file_type_extension(path: Path) -> Optional[str]:
     Raises:
          ValueError: If the file type is not recognized.
     """
+    if (extension := _SUFFIX_TO_EXT.get(path.suffix.lower())) is not None:
+        return extension
+
+    stat = os.stat(path)
+    return _guess_file_type_extension(
+        path=str(path), mtime_ns=stat.st_mtime_ns, size=stat.st_size
+    )
+
+
+@lru_cache(maxsize=4096)
+def _guess_file_type_extension(
+    path: str, mtime_ns: int, size: int
+) -> Optional[str]:
+    # mtime_ns and size are only part of the cache key. filetype loads all of
+    # its matchers on import, so it is only imported once a file needs sniffing
+    import filetype
+
     if (file_type := filetype.guess(path)) is None:
         raise ValueError("given file type is not recognized")
     return file_type.extension
+
+
+def read_magic(path: Path) -> bytes:
+    """Reads the start of a file, where its magic number is kept.
+
+    The result is reused for as long as the file's modification time and size
+    are unchanged.
+
+    Args:
+        path: The filesystem path to the file.
+
+    Returns:
+        The first bytes of the file.
+    """
+    stat = os.stat(path)
+    return _read_magic(
+        path=str(path), mtime_ns=stat.st_mtime_ns, size=stat.st_size
+    )
+
+
+@lru_cache(maxsize=4096)
+def _read_magic(path: str, mtime_ns: int, size: int) -> bytes:
+    # mtime_ns and size are only part of the cache key
+    with open(path, "rb") as file:
+        return file.read(MAGIC_NUMBER_SIZE)
+
+
+def get_buffer_type_extension(buffer: bytes) -> Optional[str]:
+    """Determines the file type of the given file header and returns its extension.
+
+    Args:
+        buffer: The first bytes of the file.
+
+    Returns:
+        The file extension if recognized, otherwise raises ValueError.
+
+    Raises:
+         ValueError: If the file type is not recognized.
+    """
+    import filetype
+
+    if (file_type := filetype.guess(buffer)) is None:
+        raise ValueError("given file type is not recognized")
+    return file_type.extension
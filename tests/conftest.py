@@ -1,6 +1,11 @@
 import bz2
 import gzip
+import hashlib
 import lzma
+import os
+import shutil
+import sys
+import tempfile
 from io import BytesIO
 from pathlib import Path
 from tarfile import TarFile, TarInfo
@@ -19,6 +24,8 @@ from filepack.compressions.consts import (
 )
 
 ARCHIVE_MEMBER_NAME = "member.txt"
+ARCHIVE_MEMBER_CONTENT = b"Hello, World!"
+EXPECTED_MEMBER_DIGEST = hashlib.sha256(ARCHIVE_MEMBER_CONTENT).digest()
 ARCHIVE_EXTENSIONS = [SEVEN_ZIP_SUFFIX, ZIP_SUFFIX, TAR_SUFFIX]
 ARCHIVE_METHODS = {
     SEVEN_ZIP_SUFFIX: lambda path: create_seven_zip(path),
@@ -26,24 +33,132 @@ ARCHIVE_METHODS = {
     ZIP_SUFFIX: lambda path: create_zip_archive(path),
 }
 COMPRESSION_EXTENSIONS = [XZ_SUFFIX, GZIP_SUFFIX, LZ4_SUFFIX, BZ2_SUFFIX]
+# the archive and compression matrix only runs the slow codecs with --slow
+COMPRESSION_FAST = [GZIP_SUFFIX, LZ4_SUFFIX]
+COMPRESSION_SLOW = [XZ_SUFFIX, BZ2_SUFFIX]
+ARCHIVE_COMPRESSION_MATRIX = [
+    pytest.param(
+        archive_extension,
+        compression_algorithm,
+        id=f"{archive_extension}-{compression_algorithm}",
+        marks=(
+            [pytest.mark.slow]
+            if compression_algorithm in COMPRESSION_SLOW
+            else []
+        ),
+    )
+    for archive_extension in ARCHIVE_EXTENSIONS
+    for compression_algorithm in COMPRESSION_FAST + COMPRESSION_SLOW
+]
 COMPRESSION_METHODS = {
     BZ2_SUFFIX: lambda f: bz2.open(f, "wb"),
     GZIP_SUFFIX: lambda f: gzip.open(f, "wb"),
     XZ_SUFFIX: lambda f: lzma.open(f, "wb"),
     LZ4_SUFFIX: lambda f: lz4.frame.open(f, "wb"),
 }
+# parameters whose value decides the xdist group a test runs in
+XDIST_GROUP_PARAMS = [
+    "archive_extension",
+    "compression_algorithm",
+    "archive_file",
+    "compressed_file",
+    "empty_archive_path",
+]
+
+
+TMPFS_PATH = Path("/dev/shm")
+
+
+def pytest_addoption(parser: pytest.Parser):
+    parser.addoption(
+        "--slow", action="store_true", help="run the tests marked as slow"
+    )
+
+
+def pytest_configure(config: pytest.Config):
+    # registered here too, so the marker is known when xdist isn't installed
+    config.addinivalue_line(
+        "markers", "xdist_group(name): run the test in the named xdist group"
+    )
+    config.addinivalue_line(
+        "markers", "slow: only run the test when --slow is given"
+    )
+
+    # the tests are bound by file I/O, so their temporary files are kept in
+    # memory unless PYTEST_TMPFS=0 or --basetemp is given. only the temp root
+    # moves, so pytest keeps numbering and locking its pytest-of-<user>
+    # directories and concurrent sessions don't wipe each other's files
+    if (
+        os.environ.get("PYTEST_TMPFS") != "0"
+        and config.option.basetemp is None
+        and "PYTEST_DEBUG_TEMPROOT" not in os.environ
+        and TMPFS_PATH.is_dir()
+        and os.access(TMPFS_PATH, os.W_OK)
+        and not is_tmpfs(Path(tempfile.gettempdir()))
+    ):
+        os.environ["PYTEST_DEBUG_TEMPROOT"] = str(TMPFS_PATH)
+
+
+def is_tmpfs(path: Path) -> bool:
+    try:
+        with open("/proc/mounts") as mounts:
+            mount_points = {
+                Path(mount_point): file_system
+                for _, mount_point, file_system, *_ in (
+                    line.split() for line in mounts
+                )
+            }
+    except OSError:
+        return False
+
+    # the closest mount point above the path decides its file system
+    path = path.resolve()
+    for mount_point in [path, *path.parents]:
+        if mount_point in mount_points:
+            return mount_points[mount_point] == "tmpfs"
+
+    return False
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+):
+    skip_slow = pytest.mark.skip(reason="slow test, run with --slow")
+
+    # tests of the same archive and compression types share a group, so with
+    # --dist=loadgroup each xdist worker owns its own codecs
+    for item in items:
+        if "slow" in item.keywords and not config.getoption("--slow"):
+            item.add_marker(skip_slow)
+
+        if (callspec := getattr(item, "callspec", None)) is None:
+            continue
+
+        extensions = [
+            str(callspec.params[name])
+            for name in XDIST_GROUP_PARAMS
+            if name in callspec.params
+        ]
+        if extensions:
+            item.add_marker(pytest.mark.xdist_group(name="-".join(extensions)))
+
+
+def file_digest(path: Path) -> bytes:
+    # compares file contents without loading whole files into memory
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").digest()
 
 
 def create_seven_zip(seven_zip_path: Path):
     with SevenZipFile(seven_zip_path, mode="w") as seven_zip:
-        content_bytes = b"Hello, World!"
+        content_bytes = ARCHIVE_MEMBER_CONTENT
         seven_zip.writestr(data=content_bytes, arcname=ARCHIVE_MEMBER_NAME)
     return seven_zip_path
 
 
 def create_tar_archive(tar_path: Path):
     with TarFile.open(tar_path, "w") as tar:
-        content_bytes = b"Hello, World!"
+        content_bytes = ARCHIVE_MEMBER_CONTENT
         tarinfo = TarInfo(name=ARCHIVE_MEMBER_NAME)
         tarinfo.size = len(content_bytes)
         tarinfo.mode = 0o644
@@ -53,44 +168,129 @@ def create_tar_archive(tar_path: Path):
 
 def create_zip_archive(zip_path: Path):
     with ZipFile(zip_path, "w") as zip_file:
-        content_bytes = b"Hello, World!"
+        content_bytes = ARCHIVE_MEMBER_CONTENT
         zip_file.writestr(ARCHIVE_MEMBER_NAME, content_bytes)
     return zip_path
 
 
-@pytest.fixture
-def txt_file(tmp_path: Path) -> Path:
-    txt_file_path = tmp_path / "new_file.txt"
+@pytest.fixture(scope="session", autouse=True)
+def warm_file_type_detection():
+    # the codecs are imported along with this module, but filetype is only
+    # loaded on the first type guess, which would skew the first test's time
+    import filetype  # noqa: F401
+
+
+# the sample files are built once per session, and each test gets its own
+# copy since tests may modify them. archives are fully copied, because
+# appending to an archive modifies it in place, while compressed files are
+# hard links to their masters
+@pytest.fixture(scope="session")
+def masters_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    return tmp_path_factory.mktemp("masters")
+
+
+@pytest.fixture(scope="session")
+def txt_file_master(masters_path: Path) -> Path:
+    txt_file_path = masters_path / "new_file.txt"
     with open(txt_file_path, "w") as file:
         file.write("Hello World !")
 
     return txt_file_path
 
 
+@pytest.fixture(scope="session")
+def archive_file_masters(masters_path: Path) -> dict[str, Path]:
+    return {
+        extension: archive_func(masters_path / f"test.{extension}")
+        for extension, archive_func in ARCHIVE_METHODS.items()
+    }
+
+
+@pytest.fixture(scope="session")
+def compressed_file_masters(
+    masters_path: Path, txt_file_master: Path
+) -> dict[str, Path]:
+    compressed_file_paths = {}
+
+    for extension, compression_func in COMPRESSION_METHODS.items():
+        compressed_file_path = masters_path / f"test_file.txt{extension}"
+
+        with open(txt_file_master, "rb") as source_file:
+            with compression_func(compressed_file_path) as file:
+                shutil.copyfileobj(source_file, file)
+
+        compressed_file_paths[extension] = compressed_file_path
+
+    return compressed_file_paths
+
+
+@pytest.fixture
+def txt_file(tmp_path: Path, txt_file_master: Path) -> Path:
+    txt_file_path = tmp_path / txt_file_master.name
+    shutil.copyfile(txt_file_master, txt_file_path)
+    return txt_file_path
+
+
 @pytest.fixture(params=ARCHIVE_EXTENSIONS)
-def archive_file(request: pytest.FixtureRequest, tmp_path: Path):
+def archive_file(
+    request: pytest.FixtureRequest,
+    tmp_path: Path,
+    archive_file_masters: dict[str, Path],
+):
     extension = request.param
-    archive_path = tmp_path / f"test.{extension}"
-    archive_func = ARCHIVE_METHODS.get(extension)
+    master_path = archive_file_masters.get(extension)
 
-    if archive_func is None:
+    if master_path is None:
         raise ValueError(f"Unsupported archive extension {extension}")
 
-    return archive_func(archive_path)
+    archive_path = tmp_path / master_path.name
+    shutil.copyfile(master_path, archive_path)
+    return archive_path
+
+
+@pytest.fixture(params=ARCHIVE_EXTENSIONS)
+def empty_archive_path(request: pytest.FixtureRequest, tmp_path: Path) -> Path:
+    return tmp_path / f"some_path.{request.param}"
 
 
 @pytest.fixture(params=COMPRESSION_EXTENSIONS)
 def compressed_file(
-    request: pytest.FixtureRequest, tmp_path: Path, txt_file: Path
+    request: pytest.FixtureRequest,
+    tmp_path: Path,
+    compressed_file_masters: dict[str, Path],
 ):
     extension = request.param
-    compressed_file_path = tmp_path / f"test_file.txt{extension}"
-    compression_func = COMPRESSION_METHODS.get(extension)
+    master_path = compressed_file_masters.get(extension)
 
-    if compression_func is None:
+    if master_path is None:
         raise ValueError(f"Unsupported compression extension {extension}")
 
-    with compression_func(compressed_file_path) as file:
-        file.write(txt_file.read_bytes())
-
+    # compressed files are only read or unlinked, never rewritten, so a hard
+    # link to the master is as good as a copy
+    compressed_file_path = tmp_path / master_path.name
+    try:
+        os.link(master_path, compressed_file_path)
+    except OSError:
+        shutil.copyfile(master_path, compressed_file_path)
     return compressed_file_path, extension
+
+
+@pytest.fixture
+def fake_pbzip2(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    # stands in for pbzip2 on the PATH, compressing with the bz2 module and
+    # leaving a marker file behind for every run
+    bin_path = tmp_path / "bin"
+    bin_path.mkdir()
+    marker_path = tmp_path / "pbzip2-runs"
+    executable_path = bin_path / "pbzip2"
+    executable_path.write_text(
+        f"#!{sys.executable}\n"
+        "import bz2, sys\n"
+        f"open({str(marker_path)!r}, 'a').write('run\\n')\n"
+        "level = int(sys.argv[2][1:])\n"
+        "data = sys.stdin.buffer.read()\n"
+        "sys.stdout.buffer.write(bz2.compress(data, level))\n"
+    )
+    executable_path.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_path}{os.pathsep}{os.environ['PATH']}")
+    return marker_path
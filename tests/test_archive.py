@@ -1,14 +1,45 @@
+import io
+import os
+import shutil
+import struct
+import subprocess
 from pathlib import Path
+from tarfile import SYMTYPE, TarFile, TarInfo
+from typing import IO
+from zipfile import (
+    ZIP_BZIP2,
+    ZIP_DEFLATED,
+    ZIP_LZMA,
+    ZIP_STORED,
+    ZipFile,
+    ZipInfo,
+)
 
 import pytest
-from conftest import ARCHIVE_EXTENSIONS, ARCHIVE_MEMBER_NAME
+from conftest import (
+    ARCHIVE_EXTENSIONS,
+    ARCHIVE_MEMBER_NAME,
+    EXPECTED_MEMBER_DIGEST,
+    file_digest,
+)
 
 from filepack.archive import Archive
+from filepack.archives import zip as zip_archive
 from filepack.archives.exceptions import (
     FailedToAddNewMemberToArchive,
     FailedToExtractArchiveMember,
     FailedToRemoveArchiveMember,
 )
+from filepack.archives.models import UnknownFileType
+from filepack.archives.zip import ZipObject
+
+
+def test_initialize_without_suffix(archive_file: Path):
+    archive_file = archive_file.rename(archive_file.with_suffix(""))
+
+    archive = Archive(path=archive_file)
+
+    assert archive.get_member(member_name=ARCHIVE_MEMBER_NAME) is not None
 
 
 def test_extract_member(archive_file: Path, tmp_path: Path):
@@ -16,7 +47,7 @@ def test_extract_member(archive_file: Path, tmp_path: Path):
         path=archive_file,
     )
 
-    extract_to = Path(tmp_path / "extract")
+    extract_to = tmp_path / "extract"
     archive.extract_member(
         member_name=ARCHIVE_MEMBER_NAME, target_directory_path=extract_to
     )
@@ -30,14 +61,16 @@ def test_extract_member_in_place(archive_file: Path, tmp_path: Path):
         path=archive_file,
     )
 
-    extract_to = Path(tmp_path / "extract")
+    extract_to = tmp_path / "extract"
     archive.extract_member(
         member_name=ARCHIVE_MEMBER_NAME,
         target_directory_path=extract_to,
         in_place=True,
     )
 
-    assert (extract_to / ARCHIVE_MEMBER_NAME).read_text() == "Hello, World!"
+    assert (
+        file_digest(extract_to / ARCHIVE_MEMBER_NAME) == EXPECTED_MEMBER_DIGEST
+    )
     assert archive.get_member(member_name=ARCHIVE_MEMBER_NAME) is None
 
 
@@ -48,11 +81,10 @@ def test_extract_non_existent_member(archive_file: Path, tmp_path: Path):
         archive.extract_member("nonexistent.txt", tmp_path)
 
 
-@pytest.mark.parametrize("archive_extension", ARCHIVE_EXTENSIONS)
 def test_extract_non_existent_member_no_archive(
-    archive_extension: str, tmp_path: Path
+    empty_archive_path: Path, tmp_path: Path
 ):
-    archive = Archive(path=tmp_path / f"some_path.{archive_extension}")
+    archive = Archive(path=empty_archive_path)
 
     with pytest.raises(FailedToExtractArchiveMember):
         archive.extract_member("nonexistent.txt", tmp_path)
@@ -69,14 +101,129 @@ def test_extract_all(archive_file: Path, tmp_path: Path):
         member_path=new_file,
     )
 
-    extract_to = Path(tmp_path / "extract")
+    extract_to = tmp_path / "extract"
     archive.extract_all(target_directory_path=extract_to)
 
-    assert (extract_to / ARCHIVE_MEMBER_NAME).read_text() == "Hello, World!"
+    assert (
+        file_digest(extract_to / ARCHIVE_MEMBER_NAME) == EXPECTED_MEMBER_DIGEST
+    )
     assert (extract_to / new_file.name).read_text() == "New content!"
     assert len(archive.get_members()) == 2
 
 
+@pytest.mark.parametrize("parallel", [True, False])
+def test_extract_all_nested_members(parallel: bool, tmp_path: Path):
+    archive_path = tmp_path / "nested.zip"
+    with ZipFile(archive_path, "w") as zip_file:
+        for directory_name in ["first", "second", "third"]:
+            zip_file.writestr(f"{directory_name}/member.txt", directory_name)
+            zip_file.writestr(
+                f"{directory_name}/inner/member.txt", directory_name
+            )
+
+    archive = Archive(path=archive_path)
+
+    extract_to = tmp_path / "extract"
+    archive.extract_all(target_directory_path=extract_to, parallel=parallel)
+
+    for directory_name in ["first", "second", "third"]:
+        assert (
+            extract_to / directory_name / "member.txt"
+        ).read_text() == directory_name
+        assert (
+            extract_to / directory_name / "inner" / "member.txt"
+        ).read_text() == directory_name
+
+
+def test_extract_all_in_parallel_under_a_single_root(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    member_names = [f"project-1.0/src/module{index}.txt" for index in range(7)]
+    archive_path = tmp_path / "project.zip"
+    with ZipFile(archive_path, "w") as zip_file:
+        zip_file.mkdir("project-1.0/empty")
+        for member_name in member_names:
+            zip_file.writestr(member_name, member_name)
+
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    # every worker extracts through its own handle of the archive
+    extracting_handles: list[ZipObject] = []
+    extract_member = ZipObject.extract_member
+
+    def recording_extract_member(self, *args, **kwargs):
+        extracting_handles.append(self)
+        return extract_member(self, *args, **kwargs)
+
+    monkeypatch.setattr(ZipObject, "extract_member", recording_extract_member)
+
+    extract_to = tmp_path / "extract"
+    Archive(path=archive_path).extract_all(target_directory_path=extract_to)
+
+    assert len({id(handle) for handle in extracting_handles}) == 4
+    assert (extract_to / "project-1.0" / "empty").is_dir()
+    for member_name in member_names:
+        assert (extract_to / member_name).read_text() == member_name
+
+
+def test_extract_all_in_parallel_with_sanitized_member_names(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    # zipfile drops the leading "../" and "/", so these pairs share a
+    # directory even though their names differ
+    member_names = [
+        "../shared/first.txt",
+        "shared/second.txt",
+        "/absolute/first.txt",
+        "absolute/second.txt",
+    ]
+    archive_path = tmp_path / "sanitized.zip"
+    with ZipFile(archive_path, "w") as zip_file:
+        for member_name in member_names:
+            zip_file.writestr(member_name, member_name)
+
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+
+    extract_to = tmp_path / "extract"
+    Archive(path=archive_path).extract_all(target_directory_path=extract_to)
+
+    assert sorted(os.listdir(extract_to)) == ["absolute", "shared"]
+    for member_name in member_names:
+        extracted_path = extract_to / member_name.removeprefix(
+            "../"
+        ).removeprefix("/")
+        assert extracted_path.read_text() == member_name
+
+
+def test_extract_all_in_parallel_retries_after_a_directory_race(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    member_names = [f"shared/member{index}.txt" for index in range(4)]
+    archive_path = tmp_path / "race.zip"
+    with ZipFile(archive_path, "w") as zip_file:
+        for member_name in member_names:
+            zip_file.writestr(member_name, member_name)
+
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    # the first attempt loses the race on creating the shared directory
+    lost_races = []
+    extract_member = ZipObject.extract_member
+
+    def racing_extract_member(self, member_name: str, *args, **kwargs):
+        if member_name == member_names[-1] and not lost_races:
+            lost_races.append(member_name)
+            raise FileExistsError(member_name)
+        return extract_member(self, member_name, *args, **kwargs)
+
+    monkeypatch.setattr(ZipObject, "extract_member", racing_extract_member)
+
+    extract_to = tmp_path / "extract"
+    Archive(path=archive_path).extract_all(target_directory_path=extract_to)
+
+    assert lost_races == [member_names[-1]]
+    for member_name in member_names:
+        assert (extract_to / member_name).read_text() == member_name
+
+
 def test_extract_all_in_place(archive_file: Path, tmp_path: Path):
     archive = Archive(
         path=archive_file,
@@ -88,10 +235,12 @@ def test_extract_all_in_place(archive_file: Path, tmp_path: Path):
         member_path=new_file,
     )
 
-    extract_to = Path(tmp_path / "extract")
+    extract_to = tmp_path / "extract"
     archive.extract_all(target_directory_path=extract_to, in_place=True)
 
-    assert (extract_to / ARCHIVE_MEMBER_NAME).read_text() == "Hello, World!"
+    assert (
+        file_digest(extract_to / ARCHIVE_MEMBER_NAME) == EXPECTED_MEMBER_DIGEST
+    )
     assert (extract_to / new_file.name).read_text() == "New content!"
     assert len(archive.get_members()) == 0
 
@@ -103,19 +252,18 @@ def test_extract_all_no_members(archive_file: Path, tmp_path: Path):
 
     archive.remove_member(member_name=ARCHIVE_MEMBER_NAME)
 
-    extract_to = Path(tmp_path / "extract")
+    extract_to = tmp_path / "extract"
     archive.extract_all(target_directory_path=extract_to)
 
     assert extract_to.exists() == False
 
 
-@pytest.mark.parametrize("archive_extension", ARCHIVE_EXTENSIONS)
 def test_extract_all_no_members_no_archive(
-    archive_extension: str, tmp_path: Path
+    empty_archive_path: Path, tmp_path: Path
 ):
-    archive = Archive(path=tmp_path / f"some_path.{archive_extension}")
+    archive = Archive(path=empty_archive_path)
 
-    extract_to = Path(tmp_path / "extract")
+    extract_to = tmp_path / "extract"
     archive.extract_all(target_directory_path=extract_to)
 
     assert extract_to.exists() == False
@@ -138,11 +286,8 @@ def test_get_members_no_files(archive_file: Path):
     assert archive.get_members() == []
 
 
-@pytest.mark.parametrize("archive_extension", ARCHIVE_EXTENSIONS)
-def test_get_members_no_files_no_archive(
-    archive_extension: str, tmp_path: Path
-):
-    archive = Archive(path=tmp_path / f"some_path.{archive_extension}")
+def test_get_members_no_files_no_archive(empty_archive_path: Path):
+    archive = Archive(path=empty_archive_path)
 
     members = archive.get_members()
 
@@ -164,17 +309,52 @@ def test_get_non_existent_member(archive_file: Path):
     assert member is None
 
 
-@pytest.mark.parametrize("archive_extension", ARCHIVE_EXTENSIONS)
-def test_get_non_existent_member_no_archive(
-    archive_extension: str, tmp_path: Path
-):
-    archive = Archive(path=tmp_path / f"some_path.{archive_extension}")
+def test_get_non_existent_member_no_archive(empty_archive_path: Path):
+    archive = Archive(path=empty_archive_path)
 
     member = archive.get_member("nonexistent.txt")
 
     assert member is None
 
 
+@pytest.mark.parametrize("archive_extension", ARCHIVE_EXTENSIONS)
+def test_get_member_type(
+    archive_extension: str, compressed_file: Path, tmp_path: Path
+):
+    compressed_file, compression_algorithm = compressed_file
+    archive = Archive(path=tmp_path / f"new_archive.{archive_extension}")
+    archive.add_member(member_path=compressed_file)
+
+    member = archive.get_member(member_name=compressed_file.name)
+
+    assert member is not None
+    assert member.type == compression_algorithm
+
+
+def test_get_member_type_of_dangling_symlink(tmp_path: Path):
+    archive_path = tmp_path / "links.tar"
+    with TarFile.open(archive_path, "w") as tar:
+        link_info = TarInfo(name="link.txt")
+        link_info.type = SYMTYPE
+        link_info.linkname = "missing.txt"
+        tar.addfile(link_info)
+
+    archive = Archive(path=archive_path)
+
+    member = archive.get_member(member_name="link.txt")
+
+    assert member is not None
+    assert member.type == str(UnknownFileType())
+
+
+def test_print_members(archive_file: Path, capsys: pytest.CaptureFixture[str]):
+    archive = Archive(path=archive_file)
+
+    archive.print_members()
+
+    assert ARCHIVE_MEMBER_NAME in capsys.readouterr().out
+
+
 def test_add_member_archive_exists(archive_file: Path, tmp_path: Path):
     archive = Archive(
         path=archive_file,
@@ -186,9 +366,7 @@ def test_add_member_archive_exists(archive_file: Path, tmp_path: Path):
         member_path=new_file,
     )
 
-    assert ARCHIVE_MEMBER_NAME in [
-        member.name for member in archive.get_members()
-    ]
+    assert archive.get_member(member_name=ARCHIVE_MEMBER_NAME) is not None
     assert new_file.exists()
 
 
@@ -203,17 +381,12 @@ def test_add_member_archive_exists_in_place(
     new_file.write_text("New content!")
     archive.add_member(member_path=new_file, in_place=True)
 
-    assert ARCHIVE_MEMBER_NAME in [
-        member.name for member in archive.get_members()
-    ]
+    assert archive.get_member(member_name=ARCHIVE_MEMBER_NAME) is not None
     assert new_file.exists() == False
 
 
-@pytest.mark.parametrize("archive_extension", ARCHIVE_EXTENSIONS)
-def test_add_member_no_archive(archive_extension: str, tmp_path: Path):
-    archive = Archive(
-        path=tmp_path / f"some_path.{archive_extension}",
-    )
+def test_add_member_no_archive(empty_archive_path: Path, tmp_path: Path):
+    archive = Archive(path=empty_archive_path)
 
     new_file = tmp_path / "newfile.txt"
     new_file.write_text("New content!")
@@ -221,7 +394,21 @@ def test_add_member_no_archive(archive_extension: str, tmp_path: Path):
         member_path=new_file,
     )
 
-    assert "newfile.txt" in [member.name for member in archive.get_members()]
+    assert archive.get_member(member_name="newfile.txt") is not None
+
+
+def test_add_members_no_archive(empty_archive_path: Path, tmp_path: Path):
+    archive = Archive(path=empty_archive_path)
+
+    new_files = [tmp_path / f"newfile{index}.txt" for index in range(3)]
+    for new_file in new_files:
+        new_file.write_text("New content!")
+    archive.add_members(member_paths=new_files, in_place=True)
+
+    assert sorted(member.name for member in archive.get_members()) == [
+        new_file.name for new_file in new_files
+    ]
+    assert not any(new_file.exists() for new_file in new_files)
 
 
 def test_add_non_existent_member(archive_file: Path, tmp_path: Path):
@@ -245,10 +432,167 @@ def test_remove_member(archive_file: Path, tmp_path: Path):
 
     archive.remove_member(member_name=ARCHIVE_MEMBER_NAME)
 
-    assert ARCHIVE_MEMBER_NAME not in [
-        member.name for member in archive.get_members()
+    member_names = {member.name for member in archive.get_members()}
+    assert ARCHIVE_MEMBER_NAME not in member_names
+    assert "newfile.txt" in member_names
+
+
+def test_remove_member_keeps_nested_members(tmp_path: Path):
+    archive_path = tmp_path / "nested.zip"
+    with ZipFile(archive_path, "w") as zip_file:
+        zip_file.writestr("directory/member.txt", "Nested content!")
+        zip_file.writestr(ARCHIVE_MEMBER_NAME, "Hello, World!")
+
+    archive = Archive(path=archive_path)
+    archive.remove_member(member_name=ARCHIVE_MEMBER_NAME)
+
+    assert [member.name for member in archive.get_members()] == [
+        "directory/member.txt"
     ]
-    assert "newfile.txt" in [member.name for member in archive.get_members()]
+    with ZipFile(archive_path, "r") as zip_file:
+        assert zip_file.read("directory/member.txt") == b"Nested content!"
+
+
+def test_remove_member_copies_zip_entries_without_recompressing(
+    tmp_path: Path,
+):
+    class UnseekableFile(io.RawIOBase):
+        # entries written to an unseekable file carry a data descriptor
+        def __init__(self, file: IO[bytes]) -> None:
+            self._file = file
+
+        def writable(self) -> bool:
+            return True
+
+        def write(self, data) -> int:  # type: ignore[override]
+            return self._file.write(data)
+
+    content = b"".join(b"line %d\n" % index for index in range(10_000))
+    archive_path = tmp_path / "compressions.zip"
+    with open(archive_path, "wb") as file:
+        with ZipFile(UnseekableFile(file), "w") as zip_file:
+            for member_name, compress_type, compress_level in [
+                ("deflated.txt", ZIP_DEFLATED, 1),
+                ("bzip2.txt", ZIP_BZIP2, 1),
+                ("lzma.txt", ZIP_LZMA, None),
+                ("stored.txt", ZIP_STORED, None),
+                (ARCHIVE_MEMBER_NAME, ZIP_DEFLATED, None),
+            ]:
+                zip_file.writestr(
+                    member_name,
+                    content,
+                    compress_type=compress_type,
+                    compresslevel=compress_level,
+                )
+
+    with ZipFile(archive_path, "r") as zip_file:
+        original_infos = {
+            member_info.filename: member_info
+            for member_info in zip_file.infolist()
+            if member_info.filename != ARCHIVE_MEMBER_NAME
+        }
+
+    Archive(path=archive_path).remove_member(member_name=ARCHIVE_MEMBER_NAME)
+
+    with ZipFile(archive_path, "r") as zip_file:
+        assert zip_file.testzip() is None
+        assert zip_file.namelist() == list(original_infos)
+        for member_info in zip_file.infolist():
+            original_info = original_infos[member_info.filename]
+            assert member_info.compress_type == original_info.compress_type
+            assert member_info.compress_size == original_info.compress_size
+            assert member_info.CRC == original_info.CRC
+            assert zip_file.read(member_info) == content
+
+
+@pytest.mark.skipif(shutil.which("zip") is None, reason="zip isn't installed")
+def test_remove_member_keeps_encrypted_zip_entries_readable(tmp_path: Path):
+    for member_name in ["first.txt", "second.txt"]:
+        (tmp_path / member_name).write_text(member_name)
+    archive_path = tmp_path / "encrypted.zip"
+    # zip writes encrypted entries with data descriptors
+    subprocess.run(
+        [
+            "zip",
+            "-q",
+            "-P",
+            "password",
+            archive_path,
+            "first.txt",
+            "second.txt",
+        ],
+        cwd=tmp_path,
+        check=True,
+    )
+
+    Archive(path=archive_path).remove_member(member_name="second.txt")
+
+    with ZipFile(archive_path, "r") as zip_file:
+        assert zip_file.namelist() == ["first.txt"]
+        assert zip_file.getinfo("first.txt").flag_bits & 0x09 == 0x09
+        assert zip_file.read("first.txt", pwd=b"password") == b"first.txt"
+
+
+def test_remove_member_keeps_zip_entries_extra_and_comment(tmp_path: Path):
+    # an extended timestamp field
+    extra = struct.pack("<HHBL", 0x5455, 5, 1, 1_700_000_000)
+    archive_path = tmp_path / "extra.zip"
+    with ZipFile(archive_path, "w") as zip_file:
+        member_info = ZipInfo("member.txt")
+        member_info.extra = extra
+        member_info.comment = b"a comment"
+        zip_file.writestr(member_info, "Hello, World!")
+        zip_file.writestr("removed.txt", "Removed!")
+
+    Archive(path=archive_path).remove_member(member_name="removed.txt")
+
+    with ZipFile(archive_path, "r") as zip_file:
+        member_info = zip_file.getinfo("member.txt")
+        assert member_info.extra == extra
+        assert member_info.comment == b"a comment"
+        assert zip_file.read(member_info) == b"Hello, World!"
+
+
+def test_remove_member_recompresses_without_zipfile_internals(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    archive_path = tmp_path / "fallback.zip"
+    with ZipFile(archive_path, "w", compression=ZIP_DEFLATED) as zip_file:
+        zip_file.writestr("member.txt", "Hello, World!")
+        zip_file.writestr("removed.txt", "Removed!")
+
+    monkeypatch.setattr(
+        zip_archive,
+        "_ZIP_WRITE_INTERNALS",
+        (*zip_archive._ZIP_WRITE_INTERNALS, "_missing_internal"),
+    )
+    Archive(path=archive_path).remove_member(member_name="removed.txt")
+
+    with ZipFile(archive_path, "r") as zip_file:
+        assert zip_file.namelist() == ["member.txt"]
+        assert zip_file.getinfo("member.txt").compress_type == ZIP_DEFLATED
+        assert zip_file.read("member.txt") == b"Hello, World!"
+
+
+def test_archive_context_keeps_members_up_to_date(
+    archive_file: Path, tmp_path: Path
+):
+    new_file = tmp_path / "newfile.txt"
+    new_file.write_text("New content!")
+
+    with Archive(path=archive_file) as archive:
+        assert archive.get_member(member_name=ARCHIVE_MEMBER_NAME) is not None
+
+        archive.add_member(member_path=new_file)
+        assert archive.member_exist(member_name="newfile.txt")
+
+        archive.remove_member(member_name=ARCHIVE_MEMBER_NAME)
+        assert [member.name for member in archive.get_members()] == [
+            "newfile.txt"
+        ]
+
+        archive.extract_all(target_directory_path=tmp_path / "extracted")
+        assert (tmp_path / "extracted" / "newfile.txt").exists()
 
 
 def test_remove_non_existent_member(archive_file: Path):
@@ -258,11 +602,8 @@ def test_remove_non_existent_member(archive_file: Path):
         archive.remove_member(member_name="nonexistent.txt")
 
 
-@pytest.mark.parametrize("archive_extension", ARCHIVE_EXTENSIONS)
-def test_remove_non_existent_member_no_archive(
-    archive_extension: str, tmp_path: Path
-):
-    archive = Archive(path=tmp_path / f"some_path.{archive_extension}")
+def test_remove_non_existent_member_no_archive(empty_archive_path: Path):
+    archive = Archive(path=empty_archive_path)
 
     with pytest.raises(FailedToRemoveArchiveMember):
         archive.remove_member(member_name="nonexistent.txt")
@@ -295,11 +636,10 @@ def test_remove_all_no_members(archive_file: Path):
     assert archive.get_members() == []
 
 
-@pytest.mark.parametrize("archive_extension", ARCHIVE_EXTENSIONS)
 def test_remove_all_no_members_no_archive(
-    archive_extension: str, tmp_path: Path
+    empty_archive_path: Path, tmp_path: Path
 ):
-    archive = Archive(path=f"some_file.{archive_extension}")
+    archive = Archive(path=empty_archive_path)
 
     new_file = tmp_path / "newfile.txt"
     new_file.write_text("New content!")
@@ -1,13 +1,22 @@
+import os
+import threading
 from pathlib import Path
 
 import pytest
-from conftest import COMPRESSION_EXTENSIONS
+from conftest import COMPRESSION_EXTENSIONS, file_digest
 
-from filepack.compression import Compression
+from filepack.compression import (
+    COMPRESSION_OPENERS,
+    Compression,
+    compress_files,
+)
+from filepack.compressions.bzip2 import Pbzip2File
+from filepack.compressions.consts import BZ2_SUFFIX
 from filepack.compressions.exceptions import (
     FailedToCompressFile,
     FailedToDecompressFile,
 )
+from filepack.compressions.models import SUFFIX_TO_TYPE
 
 
 @pytest.mark.parametrize("compression_algorithm", COMPRESSION_EXTENSIONS)
@@ -60,7 +69,7 @@ def test_compress_file_should_be_successful(
     )
 
     assert target_file.exists()
-    assert target_file.read_bytes() == txt_file.read_bytes()
+    assert file_digest(target_file) == file_digest(txt_file)
 
 
 @pytest.mark.parametrize("compression_algorithm", COMPRESSION_EXTENSIONS)
@@ -82,6 +91,55 @@ def test_compress_file_in_place_should_be_successful(
     assert not txt_file.exists()
 
 
+@pytest.mark.parametrize("compression_algorithm", COMPRESSION_EXTENSIONS)
+def test_compress_uses_the_default_level_of_the_algorithm(
+    compression_algorithm: str,
+    txt_file: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    compression_type = SUFFIX_TO_TYPE[compression_algorithm]
+    opener = COMPRESSION_OPENERS[compression_type]
+    opener_kwargs = []
+
+    def recording_opener(*args, **kwargs):
+        opener_kwargs.append(kwargs)
+        return opener(*args, **kwargs)
+
+    monkeypatch.setitem(
+        COMPRESSION_OPENERS, compression_type, recording_opener
+    )
+
+    Compression(path=txt_file).compress(
+        target_path=tmp_path / "target",
+        compression_algorithm=compression_algorithm,
+    )
+
+    assert opener_kwargs == [{"file_path": tmp_path / "target", "mode": "wb"}]
+
+
+def test_compress_lz4_uses_fast_mode_by_default(tmp_path: Path):
+    # large enough that the small input level caps don't apply
+    source_file = tmp_path / "source.txt"
+    source_file.write_text(
+        "".join(f"line {index} of {index % 97}\n" for index in range(20_000))
+    )
+    compression_object = Compression(path=source_file)
+
+    compressed_bytes = {}
+    for compression_level in (None, 0, 9):
+        target_file = tmp_path / f"level-{compression_level}.lz4"
+        compression_object.compress(
+            compression_algorithm="lz4",
+            target_path=target_file,
+            compression_level=compression_level,
+        )
+        compressed_bytes[compression_level] = target_file.read_bytes()
+
+    assert compressed_bytes[None] == compressed_bytes[0]
+    assert compressed_bytes[None] != compressed_bytes[9]
+
+
 @pytest.mark.parametrize("compression_algorithm", COMPRESSION_EXTENSIONS)
 def test_decompress_raises_error_for_non_compressed_files(
     compression_algorithm: str, txt_file: Path
@@ -120,7 +178,7 @@ def test_decompress_file_should_be_successful(
         target_path=target_file,
         compression_algorithm=compressed_file_algorithm,
     )
-    assert target_file.read_bytes() == txt_file.read_bytes()
+    assert file_digest(target_file) == file_digest(txt_file)
 
 
 def test_decompress_file_in_place_should_be_successful(
@@ -134,5 +192,134 @@ def test_decompress_file_in_place_should_be_successful(
         compression_algorithm=compressed_file_algorithm,
         in_place=True,
     )
-    assert target_file.read_bytes() == txt_file.read_bytes()
+    assert file_digest(target_file) == file_digest(txt_file)
     assert not compressed_file.exists()
+
+
+def test_uncompressed_size(compressed_file: Path, txt_file: Path):
+    compressed_file, compressed_file_algorithm = compressed_file
+    compression_object = Compression(path=compressed_file)
+
+    assert (
+        compression_object.uncompressed_size(
+            compression_algorithm=compressed_file_algorithm
+        )
+        == txt_file.stat().st_size
+    )
+
+
+@pytest.mark.parametrize("compression_algorithm", COMPRESSION_EXTENSIONS)
+def test_compressed_size(compression_algorithm: str, txt_file: Path):
+    target_file = txt_file.parent / f"{txt_file.name}.{compression_algorithm}"
+    compression_object = Compression(path=txt_file)
+    compressed_size = compression_object.compressed_size(
+        compression_algorithm=compression_algorithm, compression_level=9
+    )
+
+    compression_object.compress(
+        compression_algorithm=compression_algorithm, compression_level=9
+    )
+
+    assert compressed_size == target_file.stat().st_size
+
+
+@pytest.mark.parametrize("compression_algorithm", COMPRESSION_EXTENSIONS)
+def test_compress_files(
+    compression_algorithm: str,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setenv("COMPRESSION_WORKERS", "2")
+    files = [tmp_path / f"file{index}.txt" for index in range(3)]
+    for index, file in enumerate(files):
+        file.write_text(f"Hello World {index} !")
+
+    compressed_files = compress_files(
+        paths=files,
+        compression_algorithm=compression_algorithm,
+        in_place=True,
+    )
+
+    assert compressed_files == [
+        tmp_path / f"{file.name}.{compression_algorithm}" for file in files
+    ]
+    assert not any(file.exists() for file in files)
+    for compressed_file in compressed_files:
+        assert Compression(path=compressed_file).is_compressed(
+            compression_algorithm=compression_algorithm
+        )
+
+
+def test_open_reads_from_a_pipe(compressed_file: Path, tmp_path: Path):
+    compressed_file, compression_algorithm = compressed_file
+    fifo_path = tmp_path / f"pipe.{compression_algorithm}"
+    os.mkfifo(fifo_path)
+
+    def write_compressed_file():
+        with open(fifo_path, "wb") as fifo:
+            fifo.write(compressed_file.read_bytes())
+
+    writer = threading.Thread(target=write_compressed_file)
+    writer.start()
+    opener = COMPRESSION_OPENERS[SUFFIX_TO_TYPE[compression_algorithm]]
+    with opener(fifo_path, "rb") as file:
+        content = file.read()
+    writer.join()
+
+    with opener(compressed_file, "rb") as file:
+        assert content == file.read()
+
+
+def test_compress_bz2_uses_pbzip2_only_when_enabled(
+    txt_file: Path,
+    tmp_path: Path,
+    fake_pbzip2: Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    compression_object = Compression(path=txt_file)
+
+    compression_object.compress(
+        compression_algorithm=BZ2_SUFFIX, target_path=tmp_path / "default.bz2"
+    )
+    assert not fake_pbzip2.exists()
+
+    monkeypatch.setenv("USE_PBZIP2", "1")
+    compression_object.compress(
+        compression_algorithm=BZ2_SUFFIX, target_path=tmp_path / "pbzip2.bz2"
+    )
+    assert fake_pbzip2.read_text() == "run\n"
+    assert Compression(path=tmp_path / "pbzip2.bz2").uncompressed_size(
+        compression_algorithm=BZ2_SUFFIX
+    ) == len(txt_file.read_bytes())
+
+
+def test_pbzip2_file_removes_its_target_when_pbzip2_fails_to_start(
+    tmp_path: Path,
+):
+    target_file = tmp_path / "target.bz2"
+
+    with pytest.raises(OSError):
+        Pbzip2File(
+            executable=str(tmp_path / "missing-pbzip2"),
+            file_path=target_file,
+            compression_level=9,
+        )
+
+    assert not target_file.exists()
+
+
+def test_compressed_size_goes_through_pbzip2_when_enabled(
+    txt_file: Path, fake_pbzip2: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setenv("USE_PBZIP2", "1")
+    compression_object = Compression(path=txt_file)
+
+    compressed_size = compression_object.compressed_size(
+        compression_algorithm=BZ2_SUFFIX, compression_level=9
+    )
+    compressed_file = compression_object.compress(
+        compression_algorithm=BZ2_SUFFIX, compression_level=9, in_place=True
+    )
+
+    assert fake_pbzip2.read_text() == "run\nrun\n"
+    assert compressed_size == compressed_file.stat().st_size
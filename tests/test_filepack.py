@@ -1,7 +1,12 @@
+import os
 from pathlib import Path
 
 import pytest
-from conftest import ARCHIVE_EXTENSIONS, COMPRESSION_EXTENSIONS
+from conftest import (
+    ARCHIVE_COMPRESSION_MATRIX,
+    ARCHIVE_EXTENSIONS,
+    file_digest,
+)
 
 from filepack.filepack import FilePack
 
@@ -33,25 +38,44 @@ def test_initialize_with_non_existent_archive_file_path_with_correct_suffix_shou
 
 
 def test_initialize_with_non_existent_archive_file_path_with_incorrect_suffix_should_raise_an_exception():
-    with pytest.raises(ExceptionGroup):
+    with pytest.raises(ExceptionGroup) as exc_info:
         FilePack(path="non-existent-archive.foo-bar")
 
+    archive_error, compression_error = exc_info.value.exceptions
+    assert isinstance(archive_error, ValueError)
+    assert isinstance(compression_error, FileNotFoundError)
 
-@pytest.mark.parametrize("compression_algorithm", COMPRESSION_EXTENSIONS)
-@pytest.mark.parametrize("archive_extension", ARCHIVE_EXTENSIONS)
-def test_archive_then_compress_should_be_successful(
-    compression_algorithm: str,
+
+@pytest.mark.parametrize(
+    "archive_extension, compression_algorithm", ARCHIVE_COMPRESSION_MATRIX
+)
+def test_filepack_roundtrip(
     archive_extension: str,
+    compression_algorithm: str,
     txt_file: Path,
     tmp_path: Path,
 ):
-    new_archive_path = tmp_path / f"new_archive.{archive_extension}"
+    # compress a file, then archive it together with the original file
+    compressed_file_path = (
+        txt_file.parent / f"{txt_file.name}.{compression_algorithm}"
+    )
+    fp = FilePack(path=txt_file)
+    fp.compress(
+        target_path=compressed_file_path,
+        compression_algorithm=compression_algorithm,
+    )
+
+    fp = FilePack(path=compressed_file_path)
+    assert fp.is_compressed(compression_algorithm=compression_algorithm)
 
+    new_archive_path = tmp_path / f"new_archive.{archive_extension}"
     fp = FilePack(path=new_archive_path)
-    fp.add_member(member_path=txt_file)
+    fp.add_members(member_paths=[txt_file, compressed_file_path])
 
     assert fp.get_member(member_name=txt_file.name) is not None
+    assert fp.get_member(member_name=compressed_file_path.name) is not None
 
+    # then compress the archive itself and decompress it back
     compressed_archive_path = (
         new_archive_path.parent
         / f"{new_archive_path.name}.{compression_algorithm}"
@@ -73,58 +97,18 @@ def test_archive_then_compress_should_be_successful(
     assert not fp.is_compressed(compression_algorithm=compression_algorithm)
 
     target_file_directory_path = tmp_path / "target_dir"
-    fp.extract_member(
-        member_name=txt_file.name,
-        target_directory_path=target_file_directory_path,
-    )
-
-    directory_files = list(target_file_directory_path.iterdir())
-    assert len(directory_files) == 1
-    file = directory_files[0]
-    assert file.name == txt_file.name
-    assert file.read_bytes() == txt_file.read_bytes()
-
-
-@pytest.mark.parametrize("compression_algorithm", COMPRESSION_EXTENSIONS)
-@pytest.mark.parametrize("archive_extension", ARCHIVE_EXTENSIONS)
-def test_compress_then_archive_should_be_successful(
-    compression_algorithm: str,
-    archive_extension: str,
-    txt_file: Path,
-    tmp_path: Path,
-):
-    compressed_file_path = (
-        txt_file.parent / f"{txt_file.name}.{compression_algorithm}"
-    )
-    fp = FilePack(path=txt_file)
-    fp.compress(
-        target_path=compressed_file_path,
-        compression_algorithm=compression_algorithm,
-    )
-
-    fp = FilePack(path=compressed_file_path)
-    assert fp.is_compressed(compression_algorithm=compression_algorithm)
-
-    new_archive_path = tmp_path / f"new_archive.{archive_extension}"
-    fp = FilePack(path=new_archive_path)
-    fp.add_member(member_path=compressed_file_path)
-
-    assert fp.get_member(member_name=compressed_file_path.name) is not None
-
-    target_file_directory_path = tmp_path / "target_dir"
-    fp.extract_member(
-        member_name=compressed_file_path.name,
-        target_directory_path=target_file_directory_path,
-    )
+    fp.extract_all(target_directory_path=target_file_directory_path)
 
-    directory_files = list(target_file_directory_path.iterdir())
-    assert len(directory_files) == 1
-    file = directory_files[0]
-    assert file.name == compressed_file_path.name
+    with os.scandir(target_file_directory_path) as entries:
+        assert sorted(entry.name for entry in entries) == sorted(
+            [txt_file.name, compressed_file_path.name]
+        )
+    assert file_digest(
+        target_file_directory_path / txt_file.name
+    ) == file_digest(txt_file)
 
-    fp = FilePack(path=file)
+    fp = FilePack(path=target_file_directory_path / compressed_file_path.name)
     uncompressed_file = tmp_path / "uncompressed.txt"
-
     fp.decompress(
         target_path=uncompressed_file,
         compression_algorithm=compression_algorithm,
@@ -132,4 +116,4 @@ def test_compress_then_archive_should_be_successful(
 
     fp = FilePack(path=uncompressed_file)
     assert not fp.is_compressed(compression_algorithm=compression_algorithm)
-    assert uncompressed_file.read_bytes() == txt_file.read_bytes()
+    assert file_digest(uncompressed_file) == file_digest(txt_file)